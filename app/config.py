@@ -8,7 +8,6 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-ALLOW_SERVICE_ROLE_FALLBACK = os.getenv("ALLOW_SERVICE_ROLE_FALLBACK", "false").lower() == "true"
 
 # Validate required environment variables
 if not all([SUPABASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY]):
@@ -17,6 +16,102 @@ if not all([SUPABASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY]):
         "Please set SUPABASE_URL, SUPABASE_ANON_KEY, and SUPABASE_SERVICE_ROLE_KEY"
     )
 
+# Supabase HTTP connection pool (shared by all services)
+SUPABASE_POOL_MAX_CONNECTIONS = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "100"))
+SUPABASE_POOL_MAX_KEEPALIVE = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "20"))
+SUPABASE_POOL_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_POOL_KEEPALIVE_EXPIRY", "30"))
+SUPABASE_HTTP_TIMEOUT = float(os.getenv("SUPABASE_HTTP_TIMEOUT", "10"))
+SUPABASE_HTTP2 = os.getenv("SUPABASE_HTTP2", "true").lower() == "true"
+
+# Access token verification
+# "local" verifies JWTs in-process (JWKS / shared secret) and only calls
+# GoTrue for keys it does not know; "remote" always calls auth.get_user.
+JWT_VERIFY_MODE = os.getenv("JWT_VERIFY_MODE", "local").lower()
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+JWT_AUDIENCE = os.getenv("JWT_AUDIENCE", "authenticated")
+JWT_LEEWAY = int(os.getenv("JWT_LEEWAY", "10"))
+JWKS_CACHE_TTL = int(os.getenv("JWKS_CACHE_TTL", "600"))
+JWKS_MIN_REFRESH_INTERVAL = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL", "30"))
+
+# Token refresh coalescing (refresh tokens rotate on use)
+TOKEN_REFRESH_CACHE_TTL = int(os.getenv("TOKEN_REFRESH_CACHE_TTL", "30"))
+TOKEN_REFRESH_CACHE_SIZE = int(os.getenv("TOKEN_REFRESH_CACHE_SIZE", "10000"))
+
+# Daily question cache
+DAILY_QUESTION_CACHE_TTL = int(os.getenv("DAILY_QUESTION_CACHE_TTL", "300"))
+DAILY_QUESTION_FETCH_TIMEOUT = float(os.getenv("DAILY_QUESTION_FETCH_TIMEOUT", "1.5"))
+DAILY_QUESTION_STALE_GRACE = int(os.getenv("DAILY_QUESTION_STALE_GRACE", "60"))
+
+# Global answer distribution (public, shared by every room)
+ANSWER_DISTRIBUTION_CACHE_TTL = int(os.getenv("ANSWER_DISTRIBUTION_CACHE_TTL", "30"))
+
+# Daily question rollover
+# IANA zone defining "today" (server local time when empty)
+APP_TIMEZONE = os.getenv("APP_TIMEZONE", "")
+# Extra zones whose midnight is pre-warmed (comma separated)
+QUESTION_TIMEZONES = [tz.strip() for tz in os.getenv("QUESTION_TIMEZONES", "").split(",") if tz.strip()]
+QUESTION_PREWARM_ENABLED = os.getenv("QUESTION_PREWARM_ENABLED", "true").lower() == "true"
+QUESTION_PREWARM_LEAD = int(os.getenv("QUESTION_PREWARM_LEAD", "120"))
+MAX_TRACKED_TIMEZONES = int(os.getenv("MAX_TRACKED_TIMEZONES", "64"))
+TIMEZONE_COOKIE = os.getenv("TIMEZONE_COOKIE", "pd_tz")
+
+# Room cache
+ROOM_CACHE_SIZE = int(os.getenv("ROOM_CACHE_SIZE", "10000"))
+ROOM_CACHE_TTL = int(os.getenv("ROOM_CACHE_TTL", "300"))
+ROOM_NEGATIVE_CACHE_TTL = int(os.getenv("ROOM_NEGATIVE_CACHE_TTL", "30"))
+
+# Server-Sent Events (per worker)
+SSE_MAX_CONNECTIONS = int(os.getenv("SSE_MAX_CONNECTIONS", "500"))
+SSE_HEARTBEAT_INTERVAL = int(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))
+SSE_MAX_STREAM_SECONDS = int(os.getenv("SSE_MAX_STREAM_SECONDS", "1800"))
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "16"))
+# Re-read the answer status from the database at most this often, on a
+# heartbeat, for answers submitted on other workers
+SSE_STATUS_REFRESH_INTERVAL = int(os.getenv("SSE_STATUS_REFRESH_INTERVAL", "60"))
+
+# Rendered page cache (landing and join pages)
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", "1000"))
+PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", "300"))
+PAGE_MAX_AGE = int(os.getenv("PAGE_MAX_AGE", "60"))
+PAGE_SHARED_MAX_AGE = int(os.getenv("PAGE_SHARED_MAX_AGE", "300"))
+
+# Static assets and response compression
+STATIC_IMMUTABLE_MAX_AGE = int(os.getenv("STATIC_IMMUTABLE_MAX_AGE", "31536000"))
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+
+# Prometheus metrics at /metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Per-request upstream tracing
+SERVER_TIMING_ENABLED = (
+    os.getenv("SERVER_TIMING_ENABLED", os.getenv("DEBUG", "false")).lower() == "true"
+)
+SLOW_REQUEST_THRESHOLD_MS = int(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "1000"))
+
+# Data backend: "postgrest" (Supabase REST API) or "postgres" (direct,
+# pooled connection; needs DATABASE_URL, e.g. the Supabase pooler URL).
+# The postgres backend is experimental: its statements are covered by unit
+# tests but it has not been load tested against a live database yet.
+DATA_BACKEND = os.getenv("DATA_BACKEND", "postgrest").lower()
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DATABASE_STATEMENT_CACHE_SIZE = int(os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "256"))
+
+# Room history pagination
+ROOM_HISTORY_PAGE_SIZE = int(os.getenv("ROOM_HISTORY_PAGE_SIZE", "50"))
+ROOM_HISTORY_MAX_PAGE_SIZE = int(os.getenv("ROOM_HISTORY_MAX_PAGE_SIZE", "200"))
+
+# Pre-created room pool (0 disables it)
+ROOM_POOL_SIZE = int(os.getenv("ROOM_POOL_SIZE", "0"))
+ROOM_POOL_LOW_WATER = int(os.getenv("ROOM_POOL_LOW_WATER", str(ROOM_POOL_SIZE // 2)))
+ROOM_POOL_REFILL_INTERVAL = int(os.getenv("ROOM_POOL_REFILL_INTERVAL", "60"))
+# Unclaimed rooms older than this are deleted (cleanup_unclaimed_rooms);
+# a worker stops handing out its pooled rooms after half of it
+ROOM_POOL_MAX_AGE = int(os.getenv("ROOM_POOL_MAX_AGE", "86400"))
+ROOM_POOL_CLEANUP_INTERVAL = int(os.getenv("ROOM_POOL_CLEANUP_INTERVAL", "3600"))
+
 # App settings
 APP_NAME = os.getenv("APP_NAME", "Parejas - Daily Question Game")
 APP_URL = os.getenv("APP_URL", "").rstrip("/")
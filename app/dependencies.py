@@ -1,29 +1,25 @@
 """FastAPI dependencies."""
 from fastapi import Header, HTTPException, Response, Cookie
+from datetime import tzinfo
 from typing import Optional
 from .models import User
-from .config import DEBUG, SESSION_ACCESS_COOKIE, SESSION_REFRESH_COOKIE
+from .config import DEBUG, SESSION_ACCESS_COOKIE, SESSION_REFRESH_COOKIE, TIMEZONE_COOKIE
 from .services import auth_service
+from .utils.dates import resolve_timezone
 
 
-async def get_current_user(
+async def _resolve_user(
     response: Response,
-    authorization: Optional[str] = Header(None),
-    access_token: Optional[str] = Header(None, alias="X-Access-Token"),
-    access_cookie: Optional[str] = Cookie(None, alias=SESSION_ACCESS_COOKIE),
-    refresh_cookie: Optional[str] = Cookie(None, alias=SESSION_REFRESH_COOKIE)
+    token: Optional[str],
+    refresh_cookie: Optional[str],
+    create_anonymous: bool
 ) -> User:
-    token = None
-
-    # Prioritize Authorization header (standard)
-    if authorization and authorization.startswith("Bearer "):
-        token = authorization.split(" ")[1]
-    # Fallback for HTMX or custom header
-    elif access_token:
-        token = access_token
-
     try:
-        session = auth_service.resolve_session(token or access_cookie, refresh_cookie)
+        session = await auth_service.resolve_session(
+            token,
+            refresh_cookie,
+            create_anonymous=create_anonymous
+        )
         user = session.get("user")
         if not user:
             raise HTTPException(status_code=401, detail="Token invalido")
@@ -45,6 +41,58 @@ async def get_current_user(
         )
 
 
+def _request_token(
+    authorization: Optional[str],
+    access_token: Optional[str],
+    access_cookie: Optional[str]
+) -> Optional[str]:
+    # Prioritize Authorization header (standard)
+    if authorization and authorization.startswith("Bearer "):
+        return authorization.split(" ")[1]
+    # Fallback for HTMX or custom header
+    if access_token:
+        return access_token
+    return access_cookie
+
+
+async def get_current_user(
+    response: Response,
+    authorization: Optional[str] = Header(None),
+    access_token: Optional[str] = Header(None, alias="X-Access-Token"),
+    access_cookie: Optional[str] = Cookie(None, alias=SESSION_ACCESS_COOKIE),
+    refresh_cookie: Optional[str] = Cookie(None, alias=SESSION_REFRESH_COOKIE)
+) -> User:
+    """
+    Authenticated user for read endpoints.
+    Requests without a session get 401 instead of a new anonymous user.
+    """
+    return await _resolve_user(
+        response,
+        _request_token(authorization, access_token, access_cookie),
+        refresh_cookie,
+        create_anonymous=False
+    )
+
+
+async def get_or_create_user(
+    response: Response,
+    authorization: Optional[str] = Header(None),
+    access_token: Optional[str] = Header(None, alias="X-Access-Token"),
+    access_cookie: Optional[str] = Cookie(None, alias=SESSION_ACCESS_COOKIE),
+    refresh_cookie: Optional[str] = Cookie(None, alias=SESSION_REFRESH_COOKIE)
+) -> User:
+    """
+    Authenticated user for write endpoints.
+    The anonymous user is created here, on the visitor's first write.
+    """
+    return await _resolve_user(
+        response,
+        _request_token(authorization, access_token, access_cookie),
+        refresh_cookie,
+        create_anonymous=True
+    )
+
+
 async def get_optional_user(
     response: Response,
     authorization: Optional[str] = Header(None),
@@ -66,3 +114,14 @@ async def get_optional_user(
         )
     except HTTPException:
         return None
+
+
+async def get_request_timezone(
+    timezone_header: Optional[str] = Header(None, alias="X-Timezone"),
+    timezone_cookie: Optional[str] = Cookie(None, alias=TIMEZONE_COOKIE)
+) -> tzinfo:
+    """
+    Timezone defining the user's "today".
+    Unknown or missing zones fall back to APP_TIMEZONE.
+    """
+    return resolve_timezone(timezone_header or timezone_cookie)
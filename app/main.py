@@ -1,20 +1,63 @@
 """Main FastAPI application."""
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 
 from .routes import pages, auth, rooms, questions, responses
-from .config import APP_NAME
+from .services import question_service, event_service, room_service
+from .config import (
+    APP_NAME,
+    QUESTION_PREWARM_ENABLED,
+    ROOM_POOL_SIZE,
+    COMPRESSION_MIN_SIZE,
+    COMPRESSION_LEVEL,
+    METRICS_ENABLED,
+    SERVER_TIMING_ENABLED,
+    SLOW_REQUEST_THRESHOLD_MS
+)
+from .middleware import CompressionMiddleware, MetricsMiddleware, TracingMiddleware
+from .utils.supabase import close_supabase_clients, get_pool_stats
+from .repositories import close_repository
+from .utils.cache import get_cache_stats
+from .utils.assets import PrecompressedStaticFiles
+from .utils import metrics
 
 # Get the app directory
 app_dir = Path(__file__).parent
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background_tasks = []
+    if QUESTION_PREWARM_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(question_service.run_rollover_scheduler())
+        )
+    if ROOM_POOL_SIZE > 0:
+        background_tasks.append(
+            asyncio.create_task(room_service.run_room_pool_refiller())
+        )
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+
+    # Release pooled Supabase and database connections on shutdown
+    await close_supabase_clients()
+    await close_repository()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=APP_NAME,
     description="Daily question game for couples to connect and understand each other better",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -26,8 +69,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory=str(app_dir / "static")), name="static")
+# Compress dynamic responses above the size threshold
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MIN_SIZE,
+    compresslevel=COMPRESSION_LEVEL
+)
+
+# Upstream call tracing (Server-Timing header and slow-request log)
+app.add_middleware(
+    TracingMiddleware,
+    server_timing=SERVER_TIMING_ENABLED,
+    slow_threshold_ms=SLOW_REQUEST_THRESHOLD_MS
+)
+
+# Outermost, so latency includes compression
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Mount static files (fingerprinted builds under /static/dist, see build_static.py)
+app.mount(
+    "/static",
+    PrecompressedStaticFiles(directory=str(app_dir / "static")),
+    name="static"
+)
 
 # Include page routers (SSR)
 app.include_router(pages.router, tags=["pages"])
@@ -39,7 +104,7 @@ app.include_router(questions.router, prefix="/api/questions", tags=["questions"]
 app.include_router(responses.router, prefix="/api/responses", tags=["responses"])
 
 # Special endpoint for simplified flow
-from .services import auth_service, room_service
+from .services import auth_service
 
 @app.post("/api/start-session")
 async def start_session():
@@ -48,11 +113,13 @@ async def start_session():
     Returns access token, refresh token, and room_id.
     """
     try:
-        # Create anonymous user
-        auth_response = auth_service.create_anonymous_user()
-        
-        # Create room
-        room = room_service.create_room()
+        # User and room are independent: create them concurrently
+        auth_response, room = await asyncio.gather(
+            auth_service.create_anonymous_user(),
+            room_service.create_room()
+        )
+        # Membership needs both the user and the room
+        await room_service.add_participant(room.id, auth_response.access_token)
         
         return {
             "user_id": auth_response.user_id,
@@ -76,5 +143,55 @@ async def health_check():
     return {
         "status": "healthy",
         "app": APP_NAME,
-        "version": "2.0.0"
+        "version": "2.0.0",
+        "supabase_pool": get_pool_stats(),
+        "caches": get_cache_stats(),
+        "daily_question": question_service.get_cache_stats(),
+        "event_streams": event_service.hub.stats(),
+        "room_pool": room_service.get_room_pool_stats(),
+        "auth": auth_service.get_anonymous_user_stats()
     }
+
+
+def _collect_app_metrics():
+    """Expose the counters kept for /health as Prometheus metrics."""
+    cache_events = metrics.Counter(
+        "app_cache_events_total",
+        "In-process cache events (hits, misses, coalesced...) per cache",
+        ("cache", "event")
+    )
+    for cache, counters in get_cache_stats().items():
+        for event, value in counters.items():
+            cache_events.inc(cache, event, amount=value)
+
+    streams = metrics.Gauge("sse_connections", "Open Server-Sent Events streams")
+    streams.set(event_service.hub.stats()["connections"])
+
+    pool = get_pool_stats()
+    connections = metrics.Gauge(
+        "supabase_pool_connections",
+        "Supabase HTTP pool connections by state",
+        ("state",)
+    )
+    connections.set(pool["open_connections"], "open")
+    connections.set(pool["idle_connections"], "idle")
+
+    anonymous = metrics.Counter(
+        "anonymous_users_created_total",
+        "Anonymous GoTrue users created by this worker"
+    )
+    anonymous.inc(amount=auth_service.get_anonymous_user_stats()["anonymous_users_created"])
+
+    return [cache_events, streams, connections, anonymous]
+
+
+if METRICS_ENABLED:
+    metrics.registry.add_collector(_collect_app_metrics)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """Prometheus scrape endpoint."""
+        return PlainTextResponse(
+            metrics.render_metrics(),
+            media_type="text/plain; version=0.0.4"
+        )
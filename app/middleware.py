@@ -0,0 +1,168 @@
+"""ASGI middleware."""
+import logging
+import time
+
+import orjson
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .utils import metrics, tracing
+from .utils.http import accepts_encoding
+
+
+# Long-lived streams: never compressed (each event must reach the client
+# as soon as it is written) and never reported as slow requests
+STREAMING_MEDIA_TYPES = ("text/event-stream",)
+
+slow_request_log = logging.getLogger("app.slow_requests")
+
+
+def _passes_through(message: Message) -> bool:
+    """Whether a response should be sent without gzip."""
+    headers = Headers(raw=message["headers"])
+    return "content-encoding" in headers or headers.get(
+        "content-type", ""
+    ).startswith(STREAMING_MEDIA_TYPES)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Gzip dynamic responses above ``minimum_size``.
+
+    Responses that already carry a Content-Encoding (precompressed static
+    files) and Server-Sent Events streams, which gzip would buffer, are
+    sent as they are. The choice is made on the response start, in front
+    of starlette's responder, so it only relies on its public interface.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if accepts_encoding(headers.get("Accept-Encoding", ""), "gzip"):
+                await self._gzip(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+    async def _gzip(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def app(scope: Scope, receive: Receive, send_gzipped: Send) -> None:
+            target = send_gzipped
+
+            async def dispatch(message: Message) -> None:
+                nonlocal target
+                if message["type"] == "http.response.start" and _passes_through(message):
+                    target = send
+                await target(message)
+
+            await self.app(scope, receive, dispatch)
+
+        responder = GZipResponder(app, self.minimum_size, compresslevel=self.compresslevel)
+        await responder(scope, receive, send)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the matched route (``/api/responses/room/{room_id}``),
+    so metrics do not get one series per room id.
+    """
+    route = scope.get("route")
+    if route is not None and hasattr(route, "path"):
+        return route.path
+    # Mounted apps (static files) do not set a route
+    root_path = scope.get("root_path")
+    if root_path:
+        return root_path + "/{path}"
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Request counts, latency per route template and in-flight requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.http_requests_in_flight.dec()
+            route = route_template(scope)
+            metrics.http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                route
+            )
+            metrics.http_requests.inc(scope["method"], route, str(status_code))
+
+
+class TracingMiddleware:
+    """
+    Trace the upstream calls made while serving each request.
+
+    Adds a Server-Timing header with the per-operation breakdown when
+    enabled, and logs a structured entry for requests slower than
+    ``slow_threshold_ms`` (0 disables the log).
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False, slow_threshold_ms: int = 0):
+        self.app = app
+        self.server_timing = server_timing
+        self.slow_threshold_ms = slow_threshold_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = tracing.start_trace()
+        status_code = 500
+        streaming = False
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                streaming = headers.get("content-type", "").startswith(STREAMING_MEDIA_TYPES)
+                if self.server_timing:
+                    headers.append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed_ms = trace.elapsed() * 1000
+            if self.slow_threshold_ms and elapsed_ms >= self.slow_threshold_ms and not streaming:
+                slow_request_log.warning(orjson.dumps({
+                    "event": "slow_request",
+                    "method": scope["method"],
+                    "route": route_template(scope),
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(elapsed_ms, 1),
+                    "upstream_calls": len(trace.calls),
+                    "upstream_ms": round(sum(c.duration for c in trace.calls) * 1000, 1),
+                    "calls": [
+                        {
+                            "operation": call.operation,
+                            "duration_ms": round(call.duration * 1000, 1),
+                            "outcome": call.outcome
+                        }
+                        for call in trace.calls
+                    ]
+                }).decode())
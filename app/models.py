@@ -38,6 +38,13 @@ class RoomByTokenResponse(BaseModel):
     max_participants: int
 
 
+class RoomJoinResponse(BaseModel):
+    """Response after joining a room."""
+    room_id: str
+    participant_count: int
+    max_participants: int
+
+
 # ====================== Question Models ======================
 class QuestionOption(BaseModel):
     """Option for a question."""
@@ -54,6 +61,22 @@ class DailyQuestionResponse(BaseModel):
     options: List[QuestionOption]
 
 
+class OptionDistribution(BaseModel):
+    """How often an option was chosen, across all rooms."""
+    option_id: str
+    self_count: int
+    self_percent: float
+    prediction_count: int
+    prediction_percent: float
+
+
+class AnswerDistributionResponse(BaseModel):
+    """Global answer distribution for a daily question."""
+    daily_question_id: str
+    total_answers: int
+    options: List[OptionDistribution]
+
+
 # ====================== Response Models ======================
 class ResponseCreate(BaseModel):
     """Request model for submitting a response."""
@@ -68,6 +91,8 @@ class ResponseSubmitResult(BaseModel):
     status: str
     response_id: str
     message: Optional[str] = None
+    answer_count: Optional[int] = None
+    both_answered: Optional[bool] = None
 
 
 class ResponseDetail(BaseModel):
@@ -90,6 +115,22 @@ class StreakResponse(BaseModel):
     room_id: str
 
 
+class UserPredictionStats(BaseModel):
+    """How well one participant predicts the other."""
+    user_id: str
+    correct_predictions: int
+    accuracy: float
+    rolling_accuracy: float
+    rolling_days: int
+
+
+class RoomStatsResponse(BaseModel):
+    """Prediction accuracy aggregate for a room."""
+    room_id: str
+    days_both_answered: int
+    users: List[UserPredictionStats]
+
+
 # ====================== Anonymous Auth Models ======================
 class AnonymousAuthResponse(BaseModel):
     """Response after creating anonymous user."""
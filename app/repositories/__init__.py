@@ -0,0 +1,36 @@
+"""Data access backends, selected with DATA_BACKEND."""
+from typing import Optional
+
+from ..config import DATA_BACKEND
+from .base import HistoryCursor, Repository
+
+
+_repository: Optional[Repository] = None
+
+
+def get_repository() -> Repository:
+    """
+    The process-wide repository: PostgREST over HTTP (``postgrest``,
+    default) or a direct pooled Postgres connection (``postgres``).
+    """
+    global _repository
+    if _repository is None:
+        if DATA_BACKEND == "postgres":
+            from .postgres import PostgresRepository
+            _repository = PostgresRepository()
+        elif DATA_BACKEND == "postgrest":
+            from .postgrest import PostgrestRepository
+            _repository = PostgrestRepository()
+        else:
+            raise Exception(f"Unknown DATA_BACKEND: {DATA_BACKEND}")
+    return _repository
+
+
+async def close_repository() -> None:
+    global _repository
+    if _repository is not None:
+        repository, _repository = _repository, None
+        await repository.close()
+
+
+__all__ = ["HistoryCursor", "Repository", "get_repository", "close_repository"]
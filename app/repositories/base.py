@@ -0,0 +1,103 @@
+"""Data access interface shared by the PostgREST and Postgres backends."""
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+# Keyset position in a room's history: (created_at, response id)
+HistoryCursor = Tuple[str, str]
+
+
+class Repository(ABC):
+    """
+    Queries the services run, returning the JSON shapes PostgREST produces
+    (ids and timestamps as strings), whatever the backend.
+
+    Methods taking an access token run with that user's rights, so RLS
+    decides what they see; the others use the anon or service role.
+    """
+
+    @abstractmethod
+    async def get_daily_question(self, day: date) -> Optional[Dict[str, Any]]:
+        """Daily question as {id, text, intensity_level, options} (options by position)."""
+
+    @abstractmethod
+    async def get_answer_distribution(self, daily_question_id: str) -> List[Dict[str, Any]]:
+        """Per-option {option_id, self_count, prediction_count} totals across all rooms."""
+
+    @abstractmethod
+    async def get_room(self, column: str, value: str) -> Optional[Dict[str, Any]]:
+        """Room row by ``id`` or ``token``."""
+
+    @abstractmethod
+    async def insert_rooms(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert rooms (service role) and return the new rows."""
+
+    @abstractmethod
+    async def claim_room(self, room_id: str, claimed_at: str) -> Optional[Dict[str, Any]]:
+        """Mark a pooled room as claimed if nobody claimed it yet."""
+
+    @abstractmethod
+    async def cleanup_unclaimed_rooms(self, max_age_seconds: int) -> int:
+        """Delete pooled rooms left unclaimed for longer than ``max_age_seconds``."""
+
+    @abstractmethod
+    async def join_room(self, room_id: str, access_token: str) -> Dict[str, Any]:
+        """Call the join_room RPC (adds the caller to room_participants)."""
+
+    @abstractmethod
+    async def is_room_participant(self, room_id: str, user_id: str, access_token: str) -> bool:
+        """Whether the user is a member of the room (room_participants)."""
+
+    @abstractmethod
+    async def submit_response(self, params: Dict[str, Any], access_token: str) -> Dict[str, Any]:
+        """Call the submit_response RPC."""
+
+    @abstractmethod
+    async def get_room_responses_page(
+        self,
+        room_id: str,
+        limit: int,
+        after: Optional[HistoryCursor],
+        access_token: str
+    ) -> List[Dict[str, Any]]:
+        """Up to ``limit`` responses after the cursor, newest first, with option texts."""
+
+    @abstractmethod
+    async def get_daily_question_responses(
+        self,
+        room_id: str,
+        daily_question_id: str,
+        access_token: str
+    ) -> Optional[Dict[str, Any]]:
+        """Call the get_daily_question_responses RPC."""
+
+    @abstractmethod
+    async def get_room_streak(self, room_id: str, access_token: str) -> Optional[Dict[str, Any]]:
+        """The room's streak_count and last_streak_date."""
+
+    @abstractmethod
+    async def get_room_stats(self, room_id: str, access_token: str) -> List[Dict[str, Any]]:
+        """The room's room_stats rows (one per participant with a scored day)."""
+
+    @abstractmethod
+    async def get_answered_user_ids(
+        self,
+        room_id: str,
+        daily_question_id: str,
+        access_token: str
+    ) -> Set[str]:
+        """Ids of the users who answered a daily question in a room."""
+
+    @abstractmethod
+    async def get_room_state(
+        self,
+        room_id: str,
+        daily_question_id: str,
+        today: date,
+        access_token: str
+    ) -> Optional[Dict[str, Any]]:
+        """Call the get_room_state RPC."""
+
+    async def close(self) -> None:
+        """Release pooled connections."""
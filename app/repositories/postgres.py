@@ -0,0 +1,396 @@
+"""
+Repository talking to Postgres directly through a pooled asyncpg engine.
+
+Each call runs in its own transaction that first sets the role and
+``request.jwt.claims`` the way PostgREST does, so ``auth.uid()`` and the
+RLS policies behave exactly as they do behind the REST API. Statements
+are prepared once per connection and reused (asyncpg statement cache);
+text parameters are cast in SQL so the cursor and timestamp strings the
+services pass around bind without conversion.
+"""
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from ..config import (
+    DATABASE_URL,
+    DATABASE_POOL_SIZE,
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_STATEMENT_CACHE_SIZE
+)
+from ..utils import metrics, tracing, tokens
+from .base import HistoryCursor, Repository
+
+
+ROLES = ("anon", "authenticated", "service_role")
+
+_SET_REQUEST_CONTEXT = text(
+    "select set_config('role', :role, true), "
+    "set_config('request.jwt.claims', :claims, true)"
+)
+
+_DAILY_QUESTION = text("""
+    select jsonb_build_object(
+        'id', dq.id,
+        'text', q.text,
+        'intensity_level', q.intensity_level,
+        'options', coalesce(
+            (
+                select jsonb_agg(
+                    jsonb_build_object('id', o.id, 'text', o.text, 'position', o.position)
+                    order by o.position
+                )
+                from public.options o
+                where o.question_id = q.id
+            ),
+            '[]'::jsonb
+        )
+    )
+    from public.daily_questions dq
+    join public.questions q on q.id = dq.question_id
+    where dq.date = :day
+    limit 1
+""")
+
+_ANSWER_DISTRIBUTION = text(
+    "select public.get_answer_distribution(cast(:daily_question_id as uuid))"
+)
+
+_ROOM_BY = {
+    "id": text("select to_jsonb(r) from public.rooms r where r.id = cast(:value as uuid) limit 1"),
+    "token": text("select to_jsonb(r) from public.rooms r where r.token = :value limit 1")
+}
+
+# claimed_at keeps its column default unless the row sets it (pooled rooms)
+_INSERT_ROOMS = text("""
+    insert into public.rooms (
+        token, room_type, max_participants, is_permanent, streak_count, claimed_at
+    )
+    select e->>'token',
+           e->>'room_type',
+           (e->>'max_participants')::integer,
+           (e->>'is_permanent')::boolean,
+           coalesce((e->>'streak_count')::integer, 0),
+           case when e ? 'claimed_at' then (e->>'claimed_at')::timestamptz else now() end
+    from jsonb_array_elements(cast(:rows as jsonb)) e
+    returning to_jsonb(rooms)
+""")
+
+_CLAIM_ROOM = text("""
+    update public.rooms
+    set claimed_at = cast(cast(:claimed_at as text) as timestamptz)
+    where id = cast(:room_id as uuid)
+      and claimed_at is null
+    returning to_jsonb(rooms)
+""")
+
+_CLEANUP_UNCLAIMED_ROOMS = text(
+    "select public.cleanup_unclaimed_rooms(make_interval(secs => :max_age_seconds))"
+)
+
+_JOIN_ROOM = text("select public.join_room(cast(:room_id as uuid))")
+
+_IS_ROOM_PARTICIPANT = text("""
+    select 1
+    from public.room_participants
+    where room_id = cast(:room_id as uuid)
+      and user_id = cast(:user_id as uuid)
+""")
+
+_SUBMIT_RESPONSE = text("""
+    select public.submit_response(
+        cast(:p_room_id as uuid),
+        cast(:p_daily_question_id as uuid),
+        cast(:p_self_option_id as uuid),
+        cast(:p_partner_prediction_option_id as uuid)
+    )
+""")
+
+_HISTORY_SELECT = """
+    select to_jsonb(r) || jsonb_build_object(
+        'self_option', jsonb_build_object('text', so.text),
+        'prediction_option', jsonb_build_object('text', po.text)
+    )
+    from public.responses r
+    join public.options so on so.id = r.self_option_id
+    join public.options po on po.id = r.partner_prediction_option_id
+    where r.room_id = cast(:room_id as uuid)
+"""
+_HISTORY_ORDER = " order by r.created_at desc, r.id desc limit :limit"
+
+_HISTORY_FIRST_PAGE = text(_HISTORY_SELECT + _HISTORY_ORDER)
+_HISTORY_NEXT_PAGE = text(
+    _HISTORY_SELECT
+    + " and (r.created_at, r.id) < (cast(cast(:created_at as text) as timestamptz), cast(:response_id as uuid))"
+    + _HISTORY_ORDER
+)
+
+_DAILY_QUESTION_RESPONSES = text(
+    "select public.get_daily_question_responses("
+    "cast(:room_id as uuid), cast(:daily_question_id as uuid))"
+)
+
+_ROOM_STREAK = text("""
+    select jsonb_build_object('streak_count', streak_count, 'last_streak_date', last_streak_date)
+    from public.rooms
+    where id = cast(:room_id as uuid)
+""")
+
+_ROOM_STATS = text("""
+    select jsonb_build_object(
+        'user_id', user_id,
+        'days_both_answered', days_both_answered,
+        'correct_predictions', correct_predictions,
+        'recent_results', recent_results,
+        'last_date', last_date
+    )
+    from public.room_stats
+    where room_id = cast(:room_id as uuid)
+""")
+
+_ANSWERED_USER_IDS = text("""
+    select user_id::text
+    from public.responses
+    where room_id = cast(:room_id as uuid)
+      and daily_question_id = cast(:daily_question_id as uuid)
+""")
+
+_ROOM_STATE = text(
+    "select public.get_room_state("
+    "cast(:room_id as uuid), cast(:daily_question_id as uuid), cast(cast(:today as text) as date))"
+)
+
+
+def _engine_url(url: str):
+    parsed = make_url(url)
+    if parsed.drivername in ("postgres", "postgresql"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    # 0 disables the cache (needed behind pgbouncer in transaction mode)
+    return parsed.update_query_dict(
+        {"prepared_statement_cache_size": str(DATABASE_STATEMENT_CACHE_SIZE)}
+    )
+
+
+def _json(value: Any) -> Any:
+    # asyncpg returns json/jsonb as text unless a codec is registered
+    return orjson.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+class PostgresRepository(Repository):
+
+    def __init__(self, url: str = DATABASE_URL):
+        if not url:
+            raise Exception("DATABASE_URL is required for the postgres data backend")
+        self._url = url
+        self._engine: Optional[AsyncEngine] = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            self._engine = create_async_engine(
+                _engine_url(self._url),
+                pool_size=DATABASE_POOL_SIZE,
+                max_overflow=DATABASE_MAX_OVERFLOW,
+                pool_pre_ping=True
+            )
+        return self._engine
+
+    async def _claims_for(self, access_token: Optional[str], role: str) -> Dict[str, Any]:
+        if access_token is None:
+            return {"role": role}
+        # The same check PostgREST does before trusting the claims, with
+        # GoTrue as the fallback for keys we cannot verify locally
+        return await tokens.resolve_claims(access_token)
+
+    async def _fetch(
+        self,
+        operation: str,
+        statement,
+        params: Dict[str, Any],
+        access_token: Optional[str] = None,
+        role: str = "anon"
+    ) -> Sequence[Any]:
+        """Run one statement in a transaction scoped to the caller's role and claims."""
+        claims = await self._claims_for(access_token, role)
+        role = claims.get("role") or "authenticated"
+        if role not in ROLES:
+            raise tokens.InvalidTokenError(f"Unexpected role: {role}")
+
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(
+                    _SET_REQUEST_CONTEXT,
+                    {"role": role, "claims": orjson.dumps(claims).decode()}
+                )
+                result = await conn.execute(statement, params)
+                return [row[0] for row in result.fetchall()]
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            metrics.upstream_request_duration.observe(duration, operation)
+            metrics.upstream_requests.inc(operation, outcome)
+            tracing.record_upstream_call(operation, duration, outcome)
+
+    async def _fetch_one(self, *args, **kwargs) -> Optional[Any]:
+        rows = await self._fetch(*args, **kwargs)
+        return _json(rows[0]) if rows else None
+
+    async def get_daily_question(self, day: date) -> Optional[Dict[str, Any]]:
+        return await self._fetch_one("pg.daily_questions.select", _DAILY_QUESTION, {"day": day})
+
+    async def get_answer_distribution(self, daily_question_id: str) -> List[Dict[str, Any]]:
+        return await self._fetch_one(
+            "pg.rpc.get_answer_distribution",
+            _ANSWER_DISTRIBUTION,
+            {"daily_question_id": daily_question_id}
+        ) or []
+
+    async def get_room(self, column: str, value: str) -> Optional[Dict[str, Any]]:
+        return await self._fetch_one("pg.rooms.select", _ROOM_BY[column], {"value": value})
+
+    async def insert_rooms(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        inserted = await self._fetch(
+            "pg.rooms.insert",
+            _INSERT_ROOMS,
+            {"rows": orjson.dumps(rows).decode()},
+            role="service_role"
+        )
+        return [_json(row) for row in inserted]
+
+    async def claim_room(self, room_id: str, claimed_at: str) -> Optional[Dict[str, Any]]:
+        return await self._fetch_one(
+            "pg.rooms.update",
+            _CLAIM_ROOM,
+            {"room_id": room_id, "claimed_at": claimed_at},
+            role="service_role"
+        )
+
+    async def cleanup_unclaimed_rooms(self, max_age_seconds: int) -> int:
+        return await self._fetch_one(
+            "pg.rpc.cleanup_unclaimed_rooms",
+            _CLEANUP_UNCLAIMED_ROOMS,
+            {"max_age_seconds": max_age_seconds},
+            role="service_role"
+        ) or 0
+
+    async def join_room(self, room_id: str, access_token: str) -> Dict[str, Any]:
+        return await self._fetch_one(
+            "pg.rpc.join_room",
+            _JOIN_ROOM,
+            {"room_id": room_id},
+            access_token=access_token
+        )
+
+    async def is_room_participant(self, room_id: str, user_id: str, access_token: str) -> bool:
+        rows = await self._fetch(
+            "pg.room_participants.select",
+            _IS_ROOM_PARTICIPANT,
+            {"room_id": room_id, "user_id": user_id},
+            access_token=access_token
+        )
+        return bool(rows)
+
+    async def submit_response(self, params: Dict[str, Any], access_token: str) -> Dict[str, Any]:
+        return await self._fetch_one(
+            "pg.rpc.submit_response",
+            _SUBMIT_RESPONSE,
+            params,
+            access_token=access_token
+        )
+
+    async def get_room_responses_page(
+        self,
+        room_id: str,
+        limit: int,
+        after: Optional[HistoryCursor],
+        access_token: str
+    ) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {"room_id": room_id, "limit": limit}
+        statement = _HISTORY_FIRST_PAGE
+        if after:
+            params["created_at"], params["response_id"] = after
+            statement = _HISTORY_NEXT_PAGE
+
+        rows = await self._fetch(
+            "pg.responses.select",
+            statement,
+            params,
+            access_token=access_token
+        )
+        return [_json(row) for row in rows]
+
+    async def get_daily_question_responses(
+        self,
+        room_id: str,
+        daily_question_id: str,
+        access_token: str
+    ) -> Optional[Dict[str, Any]]:
+        return await self._fetch_one(
+            "pg.rpc.get_daily_question_responses",
+            _DAILY_QUESTION_RESPONSES,
+            {"room_id": room_id, "daily_question_id": daily_question_id},
+            access_token=access_token
+        )
+
+    async def get_room_streak(self, room_id: str, access_token: str) -> Optional[Dict[str, Any]]:
+        return await self._fetch_one(
+            "pg.rooms.select",
+            _ROOM_STREAK,
+            {"room_id": room_id},
+            access_token=access_token
+        )
+
+    async def get_room_stats(self, room_id: str, access_token: str) -> List[Dict[str, Any]]:
+        rows = await self._fetch(
+            "pg.room_stats.select",
+            _ROOM_STATS,
+            {"room_id": room_id},
+            access_token=access_token
+        )
+        return [_json(row) for row in rows]
+
+    async def get_answered_user_ids(
+        self,
+        room_id: str,
+        daily_question_id: str,
+        access_token: str
+    ) -> Set[str]:
+        rows = await self._fetch(
+            "pg.responses.select",
+            _ANSWERED_USER_IDS,
+            {"room_id": room_id, "daily_question_id": daily_question_id},
+            access_token=access_token
+        )
+        return set(rows)
+
+    async def get_room_state(
+        self,
+        room_id: str,
+        daily_question_id: str,
+        today: date,
+        access_token: str
+    ) -> Optional[Dict[str, Any]]:
+        return await self._fetch_one(
+            "pg.rpc.get_room_state",
+            _ROOM_STATE,
+            {
+                "room_id": room_id,
+                "daily_question_id": daily_question_id,
+                "today": today.isoformat()
+            },
+            access_token=access_token
+        )
+
+    async def close(self) -> None:
+        if self._engine is not None:
+            engine, self._engine = self._engine, None
+            await engine.dispose()
@@ -0,0 +1,212 @@
+"""Repository backed by Supabase PostgREST over the shared HTTP pool."""
+from datetime import date
+from typing import Any, Dict, List, Optional, Set
+
+from ..utils.supabase import get_supabase_client, get_supabase_authed_client
+from .base import HistoryCursor, Repository
+
+
+class PostgrestRepository(Repository):
+
+    async def get_daily_question(self, day: date) -> Optional[Dict[str, Any]]:
+        supabase = get_supabase_client()
+
+        # Fetch daily question with related question and options
+        result = await supabase.table("daily_questions")\
+            .select("""
+                id,
+                questions!inner(
+                    text,
+                    intensity_level,
+                    options(id, text, position)
+                )
+            """)\
+            .eq("date", str(day))\
+            .limit(1)\
+            .execute()
+
+        if not result.data:
+            return None
+
+        row = result.data[0]
+        question = row["questions"]
+        return {
+            "id": row["id"],
+            "text": question["text"],
+            "intensity_level": question["intensity_level"],
+            "options": sorted(question["options"], key=lambda x: x["position"])
+        }
+
+    async def get_answer_distribution(self, daily_question_id: str) -> List[Dict[str, Any]]:
+        supabase = get_supabase_client()
+
+        result = await supabase.rpc(
+            "get_answer_distribution",
+            {"p_daily_question_id": daily_question_id}
+        ).execute()
+
+        return result.data or []
+
+    async def get_room(self, column: str, value: str) -> Optional[Dict[str, Any]]:
+        supabase = get_supabase_client()
+
+        result = await supabase.table("rooms")\
+            .select("*")\
+            .eq(column, value)\
+            .limit(1)\
+            .execute()
+
+        return result.data[0] if result.data else None
+
+    async def insert_rooms(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        supabase = get_supabase_client(use_service_role=True)
+        result = await supabase.table("rooms").insert(rows).execute()
+        return result.data or []
+
+    async def claim_room(self, room_id: str, claimed_at: str) -> Optional[Dict[str, Any]]:
+        supabase = get_supabase_client(use_service_role=True)
+
+        result = await supabase.table("rooms")\
+            .update({"claimed_at": claimed_at})\
+            .eq("id", room_id)\
+            .is_("claimed_at", "null")\
+            .execute()
+
+        return result.data[0] if result.data else None
+
+    async def cleanup_unclaimed_rooms(self, max_age_seconds: int) -> int:
+        supabase = get_supabase_client(use_service_role=True)
+
+        result = await supabase.rpc(
+            "cleanup_unclaimed_rooms",
+            {"max_age": f"{max_age_seconds} seconds"}
+        ).execute()
+
+        return result.data or 0
+
+    async def join_room(self, room_id: str, access_token: str) -> Dict[str, Any]:
+        supabase = get_supabase_authed_client(access_token)
+        result = await supabase.rpc("join_room", {"p_room_id": room_id}).execute()
+        return result.data
+
+    async def is_room_participant(self, room_id: str, user_id: str, access_token: str) -> bool:
+        supabase = get_supabase_authed_client(access_token)
+
+        result = await supabase.table("room_participants")\
+            .select("room_id")\
+            .eq("room_id", room_id)\
+            .eq("user_id", user_id)\
+            .limit(1)\
+            .execute()
+
+        return bool(result.data)
+
+    async def submit_response(self, params: Dict[str, Any], access_token: str) -> Dict[str, Any]:
+        supabase = get_supabase_authed_client(access_token)
+        result = await supabase.rpc("submit_response", params).execute()
+        return result.data
+
+    async def get_room_responses_page(
+        self,
+        room_id: str,
+        limit: int,
+        after: Optional[HistoryCursor],
+        access_token: str
+    ) -> List[Dict[str, Any]]:
+        supabase = get_supabase_authed_client(access_token)
+
+        query = supabase.table("responses")\
+            .select("""
+                *,
+                self_option:options!self_option_id(text),
+                prediction_option:options!partner_prediction_option_id(text)
+            """)\
+            .eq("room_id", room_id)
+
+        if after:
+            created_at, response_id = after
+            # Rows strictly after the cursor in (created_at desc, id desc) order
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{response_id})'
+            )
+
+        result = await query\
+            .order("created_at", desc=True)\
+            .order("id", desc=True)\
+            .limit(limit)\
+            .execute()
+
+        return result.data or []
+
+    async def get_daily_question_responses(
+        self,
+        room_id: str,
+        daily_question_id: str,
+        access_token: str
+    ) -> Optional[Dict[str, Any]]:
+        supabase = get_supabase_authed_client(access_token)
+
+        result = await supabase.rpc(
+            "get_daily_question_responses",
+            {"p_room_id": room_id, "p_daily_question_id": daily_question_id}
+        ).execute()
+
+        return result.data
+
+    async def get_room_streak(self, room_id: str, access_token: str) -> Optional[Dict[str, Any]]:
+        supabase = get_supabase_authed_client(access_token)
+
+        result = await supabase.table("rooms")\
+            .select("streak_count, last_streak_date")\
+            .eq("id", room_id)\
+            .limit(1)\
+            .execute()
+
+        return result.data[0] if result.data else None
+
+    async def get_room_stats(self, room_id: str, access_token: str) -> List[Dict[str, Any]]:
+        supabase = get_supabase_authed_client(access_token)
+
+        result = await supabase.table("room_stats")\
+            .select("user_id, days_both_answered, correct_predictions, recent_results, last_date")\
+            .eq("room_id", room_id)\
+            .execute()
+
+        return result.data or []
+
+    async def get_answered_user_ids(
+        self,
+        room_id: str,
+        daily_question_id: str,
+        access_token: str
+    ) -> Set[str]:
+        supabase = get_supabase_authed_client(access_token)
+
+        result = await supabase.table("responses")\
+            .select("user_id")\
+            .eq("room_id", room_id)\
+            .eq("daily_question_id", daily_question_id)\
+            .execute()
+
+        return {r["user_id"] for r in result.data or []}
+
+    async def get_room_state(
+        self,
+        room_id: str,
+        daily_question_id: str,
+        today: date,
+        access_token: str
+    ) -> Optional[Dict[str, Any]]:
+        supabase = get_supabase_authed_client(access_token)
+
+        result = await supabase.rpc(
+            "get_room_state",
+            {
+                "p_room_id": room_id,
+                "p_daily_question_id": daily_question_id,
+                "p_today": today.isoformat()
+            }
+        ).execute()
+
+        return result.data
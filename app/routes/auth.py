@@ -4,6 +4,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from ..services import auth_service, room_service
 from ..models import AnonymousAuthResponse
+from ..utils.http import model_response
 
 
 router = APIRouter()
@@ -20,7 +21,7 @@ async def create_anonymous_user():
     Returns access token and refresh token.
     """
     try:
-        return auth_service.create_anonymous_user()
+        return model_response(await auth_service.create_anonymous_user())
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -34,7 +35,7 @@ async def refresh_access_token(request: RefreshTokenRequest):
     Refresh an access token using a refresh token.
     """
     try:
-        return auth_service.refresh_token(request.refresh_token)
+        return await auth_service.refresh_token(request.refresh_token)
     except Exception as e:
         raise HTTPException(
             status_code=401,
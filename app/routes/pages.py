@@ -1,68 +1,144 @@
 """SSR (Server-Side Rendering) page routes."""
-from fastapi import APIRouter, Request, HTTPException
+from datetime import datetime, timezone, tzinfo
+from fastapi import APIRouter, Request, HTTPException, Depends, Response
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple
 from ..services import room_service, question_service, auth_service
-from ..config import SESSION_ACCESS_COOKIE, SESSION_REFRESH_COOKIE
+from ..config import SESSION_ACCESS_COOKIE, SESSION_REFRESH_COOKIE, TIMEZONE_COOKIE
 from ..config import APP_URL
+from ..config import PAGE_CACHE_SIZE, PAGE_CACHE_TTL, PAGE_MAX_AGE, PAGE_SHARED_MAX_AGE
+from ..dependencies import get_request_timezone
+from ..utils.cache import LRUCache, register_cache_stats
+from ..utils.dates import next_rollover, today_in, default_timezone
+from ..utils.http import strong_etag, is_not_modified
+from ..utils.assets import static_url
 
 
 router = APIRouter()
 templates = Jinja2Templates(directory=str(Path(__file__).parent.parent / "templates"))
+templates.env.globals["timezone_cookie"] = TIMEZONE_COOKIE
+templates.env.globals["static_url"] = static_url
+
+# Rendered HTML of pages that are identical for every visitor on a given
+# day, keyed by (template, day, params) -> (body, etag)
+_page_cache = LRUCache(
+    PAGE_CACHE_SIZE,
+    PAGE_CACHE_TTL,
+    stats=register_cache_stats("pages")
+)
+
+
+def _render(name: str, context: Dict[str, Any]) -> Tuple[str, str]:
+    body = templates.get_template(name).render(context)
+    return body, strong_etag(body)
+
+
+def _cached_page_response(
+    request: Request,
+    body: str,
+    etag: str,
+    tz: tzinfo,
+    vary: Optional[str] = None
+) -> Response:
+    # Never let a cache keep the page past the day's rollover
+    now = datetime.now(timezone.utc)
+    until_rollover = max(0, int((next_rollover(tz, now) - now).total_seconds()))
+    max_age = min(PAGE_MAX_AGE, until_rollover)
+    if vary:
+        # Varying on the visitor's cookies makes every session its own
+        # variant, so only the browser may keep such a page
+        cache_control = f"private, max-age={max_age}"
+    else:
+        cache_control = (
+            f"public, max-age={max_age}, "
+            f"s-maxage={min(PAGE_SHARED_MAX_AGE, until_rollover)}"
+        )
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary:
+        headers["Vary"] = vary
+
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(body, headers=headers)
+
+
+def _cache_key(name: str, tz: tzinfo, *params: Hashable) -> Tuple[Hashable, ...]:
+    return (name, today_in(tz).isoformat()) + params
 
 
 @router.get("/", response_class=HTMLResponse)
-async def index(request: Request):
+async def index(request: Request, tz: tzinfo = Depends(get_request_timezone)):
     """Landing page with today's question."""
-    # Get today's question
-    try:
-        question = question_service.get_today_daily_question()
-    except:
-        question = None
+    key = _cache_key("index.html", tz)
+    found, page = _page_cache.get(key)
+    if not found:
+        # Get today's question
+        try:
+            question = await question_service.get_today_daily_question(tz)
+        except:
+            question = None
+
+        page = _render(
+            "index.html",
+            {"request": request, "user": None, "question": question, "app_url": APP_URL}
+        )
+        # A missing question may be a transient upstream error
+        if question:
+            _page_cache.set(key, page)
 
-    response = templates.TemplateResponse(
-        "index.html",
-        {"request": request, "user": None, "question": question, "app_url": APP_URL}
-    )
-    return response
+    # "Today" follows the timezone cookie or header
+    return _cached_page_response(request, *page, tz, vary="Cookie, X-Timezone")
 
 
 @router.get("/join-room", response_class=HTMLResponse)
 async def join_room_page(request: Request, token: str = None, error: str = None):
     """Page to join a room with a token."""
-    response = templates.TemplateResponse(
-        "join_room.html",
-        {
-            "request": request,
-            "token": token,
-            "error": error,
-            "app_url": APP_URL,
-            "user": None
-        }
-    )
-    return response
+    tz = default_timezone()
+    key = _cache_key("join_room.html", tz, token, error)
+    found, page = _page_cache.get(key)
+    if not found:
+        page = _render(
+            "join_room.html",
+            {
+                "request": request,
+                "token": token,
+                "error": error,
+                "app_url": APP_URL,
+                "user": None
+            }
+        )
+        _page_cache.set(key, page)
+
+    return _cached_page_response(request, *page, tz)
 
 
 @router.get("/question/{room_id}", response_class=HTMLResponse)
 async def question_page(
     request: Request,
-    room_id: str
+    room_id: str,
+    tz: tzinfo = Depends(get_request_timezone)
 ):
     """
     Page to answer today's question.
     """
     try:
         # Get room details
-        room = room_service.get_room_by_id(room_id)
+        room = await room_service.get_room_by_id(room_id)
         
         # Get today's question
-        question = question_service.get_today_daily_question()
+        question = await question_service.get_today_daily_question(tz)
         
-        session = auth_service.resolve_session(
-            request.cookies.get(SESSION_ACCESS_COOKIE),
-            request.cookies.get(SESSION_REFRESH_COOKIE)
-        )
+        # Read-only for visitors without a session: the anonymous user
+        # is created when they first submit an answer
+        try:
+            session = await auth_service.resolve_session(
+                request.cookies.get(SESSION_ACCESS_COOKIE),
+                request.cookies.get(SESSION_REFRESH_COOKIE)
+            )
+        except Exception:
+            session = {"user": None}
         user = session.get("user")
 
         response = templates.TemplateResponse(
@@ -1,22 +1,50 @@
 """Question API routes."""
-from fastapi import APIRouter, HTTPException
+from datetime import tzinfo
+from fastapi import APIRouter, HTTPException, Depends
 from ..services import question_service
-from ..models import DailyQuestionResponse
+from ..models import AnswerDistributionResponse, DailyQuestionResponse
+from ..dependencies import get_request_timezone
+from ..config import ANSWER_DISTRIBUTION_CACHE_TTL
+from ..utils.http import model_response
 
 
 router = APIRouter()
 
 
 @router.get("/today", response_model=DailyQuestionResponse)
-async def get_today_question():
+async def get_today_question(tz: tzinfo = Depends(get_request_timezone)):
     """
     Get today's daily question with options.
     Public endpoint - no auth required.
+    "Today" follows the X-Timezone header or timezone cookie.
     """
     try:
-        return question_service.get_today_daily_question()
+        return model_response(await question_service.get_today_daily_question(tz))
     except Exception as e:
         raise HTTPException(
             status_code=404,
             detail=f"No question available: {str(e)}"
         )
+
+
+@router.get("/today/distribution", response_model=AnswerDistributionResponse)
+async def get_today_answer_distribution(tz: tzinfo = Depends(get_request_timezone)):
+    """
+    Get how all rooms answered today's question, per option.
+    Public endpoint - no auth required.
+    """
+    try:
+        distribution = await question_service.get_today_answer_distribution(tz)
+    except Exception as e:
+        error_msg = str(e)
+        if "No question" in error_msg:
+            raise HTTPException(status_code=404, detail=f"No question available: {error_msg}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to load answer distribution: {error_msg}"
+        )
+
+    response = model_response(distribution)
+    response.headers["Cache-Control"] = f"public, max-age={ANSWER_DISTRIBUTION_CACHE_TTL}"
+    response.headers["Vary"] = "Cookie, X-Timezone"
+    return response
@@ -1,14 +1,28 @@
 """Response API routes."""
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from ..services import response_service
+import asyncio
+import time
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import List, Optional
+from ..services import response_service, event_service
 from ..models import (
     ResponseCreate,
     ResponseSubmitResult,
     StreakResponse,
+    RoomStatsResponse,
     User
 )
-from ..dependencies import get_current_user
+from ..dependencies import get_current_user, get_or_create_user
+from ..utils.http import carry_headers, json_response, model_response
+from ..config import (
+    SSE_HEARTBEAT_INTERVAL,
+    SSE_MAX_STREAM_SECONDS,
+    SSE_STATUS_REFRESH_INTERVAL,
+    ROOM_HISTORY_PAGE_SIZE,
+    ROOM_HISTORY_MAX_PAGE_SIZE
+)
 
 
 router = APIRouter()
@@ -17,17 +31,18 @@ router = APIRouter()
 @router.post("", response_model=ResponseSubmitResult)
 async def submit_response(
     response_data: ResponseCreate,
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    current_user: User = Depends(get_or_create_user)
 ):
     """
     Submit user's answer and partner prediction.
     """
     try:
-        return response_service.submit_response(
+        return model_response(await response_service.submit_response(
             response_data,
             current_user.id,
             current_user.access_token
-        )
+        ), response)
     except Exception as e:
         error_msg = str(e)
         status_code = 409 if "already answered" in error_msg else 400
@@ -37,27 +52,65 @@ async def submit_response(
 @router.get("/room/{room_id}")
 async def get_room_responses(
     room_id: str,
+    response: Response,
+    limit: int = Query(ROOM_HISTORY_PAGE_SIZE, ge=1, le=ROOM_HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all responses for a room.
+    Get a room's responses, newest first.
     User must be a participant in the room.
+
+    Returns one page plus next_cursor; pass it back as ``cursor`` for the
+    next page. With ``format=ndjson`` the whole history is streamed as
+    newline-delimited JSON, one response per line.
     """
     try:
-        return response_service.get_room_responses(
+        page = await response_service.get_room_responses(
             room_id,
             current_user.id,
-            current_user.access_token
+            current_user.access_token,
+            limit=ROOM_HISTORY_MAX_PAGE_SIZE if format == "ndjson" else limit,
+            cursor=cursor
         )
     except Exception as e:
-        status_code = 403 if "not a participant" in str(e) else 500
-        raise HTTPException(status_code=status_code, detail=str(e))
+        error_msg = str(e)
+        if "not a participant" in error_msg:
+            status_code = 403
+        elif "Invalid cursor" in error_msg:
+            status_code = 400
+        else:
+            status_code = 500
+        raise HTTPException(status_code=status_code, detail=error_msg)
+
+    # Rows come straight from PostgREST: already JSON-native
+    if format == "json":
+        return json_response(page, response)
+
+    async def export():
+        for row in page["responses"]:
+            yield orjson.dumps(row) + b"\n"
+        if page["next_cursor"]:
+            rows = response_service.iter_room_responses(
+                room_id,
+                current_user.access_token,
+                page["next_cursor"]
+            )
+            async for row in rows:
+                yield orjson.dumps(row) + b"\n"
+
+    return carry_headers(
+        StreamingResponse(export(), media_type="application/x-ndjson"),
+        response
+    )
 
 
 @router.get("/room/{room_id}/daily/{daily_question_id}")
 async def get_daily_question_responses(
     room_id: str,
     daily_question_id: str,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -65,30 +118,55 @@ async def get_daily_question_responses(
     User must be a participant in the room.
     """
     try:
-        return response_service.get_daily_question_responses(
+        return json_response(await response_service.get_daily_question_responses(
             room_id,
             daily_question_id,
             current_user.id,
             current_user.access_token
-        )
+        ), response)
     except Exception as e:
         status_code = 403 if "not a participant" in str(e) else 500
         raise HTTPException(status_code=status_code, detail=str(e))
 
 
+@router.get("/room/{room_id}/state/{daily_question_id}")
+async def get_room_state(
+    room_id: str,
+    daily_question_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get answer status, both responses, prediction matches and streak
+    for a room and daily question in a single call.
+    """
+    try:
+        return json_response(await response_service.get_room_state(
+            room_id,
+            daily_question_id,
+            current_user.access_token
+        ), response)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to load room state: {str(e)}"
+        )
+
+
 @router.get("/room/{room_id}/streak", response_model=StreakResponse)
 async def get_room_streak(
     room_id: str,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ):
     """
     Get current streak for a room.
     """
     try:
-        return response_service.calculate_streak(
+        return model_response(await response_service.calculate_streak(
             room_id,
             current_user.access_token
-        )
+        ), response)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -96,24 +174,155 @@ async def get_room_streak(
         )
 
 
+@router.get("/room/{room_id}/stats", response_model=RoomStatsResponse)
+async def get_room_stats(
+    room_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get prediction accuracy per participant for a room.
+    """
+    try:
+        return model_response(await response_service.get_room_stats(
+            room_id,
+            current_user.access_token
+        ), response)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to load room stats: {str(e)}"
+        )
+
+
 @router.get("/room/{room_id}/status/{daily_question_id}")
 async def check_answer_status(
     room_id: str,
     daily_question_id: str,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ):
     """
     Check if both participants have answered today's question.
     """
     try:
-        return response_service.check_both_answered(
+        return json_response(await response_service.check_both_answered(
             room_id,
             daily_question_id,
             current_user.id,
             current_user.access_token
+        ), response)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to check status: {str(e)}"
+        )
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
+@router.get("/room/{room_id}/events/{daily_question_id}")
+async def stream_answer_events(
+    request: Request,
+    room_id: str,
+    daily_question_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Server-Sent Events stream of the answer status for a room and day.
+    Sends the current status, then a new one whenever a participant
+    answers, with heartbeats in between. Closes once both answered.
+    User must be a participant in the room.
+
+    The stream subscribes before reading the answered set, so an answer
+    published in between is not lost (a duplicate event is harmless).
+    Answers submitted on other workers never reach this worker's hub, so
+    the status is also re-read from the database every
+    SSE_STATUS_REFRESH_INTERVAL seconds, on a heartbeat.
+    """
+    try:
+        await response_service.ensure_room_participant(
+            room_id,
+            current_user.id,
+            current_user.access_token
+        )
+    except Exception as e:
+        status_code = 403 if "not a participant" in str(e) else 500
+        raise HTTPException(status_code=status_code, detail=str(e))
+
+    try:
+        queue = event_service.hub.subscribe(room_id, daily_question_id)
+    except event_service.TooManySubscribers as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    try:
+        answered = await response_service.get_answered_user_ids(
+            room_id,
+            daily_question_id,
+            current_user.access_token
         )
     except Exception as e:
+        event_service.hub.unsubscribe(room_id, daily_question_id, queue)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to check status: {str(e)}"
         )
+
+    async def events():
+        nonlocal answered
+        try:
+            status = response_service.build_answer_status(
+                room_id, daily_question_id, current_user.id, answered
+            )
+            yield _sse("status", status)
+
+            deadline = time.monotonic() + SSE_MAX_STREAM_SECONDS
+            refreshed_at = time.monotonic()
+            while not status["both_answered"] and time.monotonic() < deadline:
+                if await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=SSE_HEARTBEAT_INTERVAL
+                    )
+                    answered.add(event["user_id"])
+                except asyncio.TimeoutError:
+                    if time.monotonic() - refreshed_at < SSE_STATUS_REFRESH_INTERVAL:
+                        yield ": heartbeat\n\n"
+                        continue
+                    refreshed_at = time.monotonic()
+                    try:
+                        answered |= await response_service.get_answered_user_ids(
+                            room_id,
+                            daily_question_id,
+                            current_user.access_token
+                        )
+                    except Exception:
+                        # Keep streaming; the next refresh may succeed
+                        yield ": heartbeat\n\n"
+                        continue
+
+                latest = response_service.build_answer_status(
+                    room_id, daily_question_id, current_user.id, answered
+                )
+                if latest != status:
+                    status = latest
+                    yield _sse("status", status)
+                else:
+                    yield ": heartbeat\n\n"
+        finally:
+            event_service.hub.unsubscribe(room_id, daily_question_id, queue)
+
+    return carry_headers(StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also release the slot if the stream never started iterating
+        background=BackgroundTask(
+            event_service.hub.unsubscribe, room_id, daily_question_id, queue
+        )
+    ), response)
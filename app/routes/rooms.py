@@ -1,21 +1,28 @@
 """Room API routes."""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from ..services import room_service
-from ..models import RoomResponse, RoomByTokenResponse, User
-from ..dependencies import get_current_user
+from ..models import RoomResponse, RoomByTokenResponse, RoomJoinResponse, User
+from ..dependencies import get_current_user, get_or_create_user
+from ..utils.http import json_response, model_response
 
 
 router = APIRouter()
 
 
 @router.post("", response_model=RoomResponse)
-async def create_room(current_user: User = Depends(get_current_user)):
+async def create_room(
+    response: Response,
+    current_user: User = Depends(get_or_create_user)
+):
     """
-    Create a new couple room.
+    Create a new couple room, with the caller as its first participant.
     Returns room details including shareable token.
     """
     try:
-        return room_service.create_room()
+        return model_response(
+            await room_service.create_room(current_user.access_token),
+            response
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -30,7 +37,7 @@ async def get_room_by_token(token: str):
     Public endpoint - no auth required.
     """
     try:
-        return room_service.get_room_by_token(token)
+        return model_response(await room_service.get_room_by_token(token))
     except Exception as e:
         raise HTTPException(
             status_code=404,
@@ -38,9 +45,39 @@ async def get_room_by_token(token: str):
         )
 
 
+@router.post("/{token}/join", response_model=RoomJoinResponse)
+async def join_room(
+    token: str,
+    response: Response,
+    current_user: User = Depends(get_or_create_user)
+):
+    """
+    Join a room by token.
+    The caller becomes a participant and can read the room's responses.
+    """
+    try:
+        return model_response(
+            await room_service.join_room(token, current_user.access_token),
+            response
+        )
+    except Exception as e:
+        error_msg = str(e)
+        if "Invalid room token" in error_msg or "Room not found" in error_msg:
+            status_code = 404
+        elif "Room is full" in error_msg:
+            status_code = 409
+        else:
+            status_code = 500
+        raise HTTPException(
+            status_code=status_code,
+            detail=f"Failed to join room: {error_msg}"
+        )
+
+
 @router.get("/id/{room_id}")
 async def get_room_by_id(
     room_id: str,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -48,7 +85,7 @@ async def get_room_by_id(
     Requires authentication.
     """
     try:
-        return room_service.get_room_by_id(room_id)
+        return json_response(await room_service.get_room_by_id(room_id), response)
     except Exception as e:
         raise HTTPException(
             status_code=404,
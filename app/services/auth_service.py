@@ -1,28 +1,66 @@
 """Authentication service."""
-from typing import Optional, Dict, Any
+import hashlib
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Deque
 from fastapi import Response
 from ..utils.supabase import get_supabase_client
+from ..utils import tokens
+from ..utils.cache import LRUCache, SingleFlight, register_cache_stats
 from ..models import AnonymousAuthResponse, User
 from ..config import (
     SESSION_ACCESS_COOKIE,
     SESSION_REFRESH_COOKIE,
     COOKIE_MAX_AGE,
     COOKIE_SAMESITE,
-    COOKIE_SECURE
+    COOKIE_SECURE,
+    JWT_VERIFY_MODE,
+    TOKEN_REFRESH_CACHE_TTL,
+    TOKEN_REFRESH_CACHE_SIZE
 )
 
 
-def create_anonymous_user() -> AnonymousAuthResponse:
+# Anonymous sign-ups, for spotting crawlers that mint users
+_anonymous_created_total = 0
+_anonymous_created_recent: Deque[float] = deque()
+
+
+async def _sign_in_anonymously():
+    global _anonymous_created_total
+
+    supabase = get_supabase_client()
+    response = await supabase.auth.sign_in_anonymously()
+
+    if response.user:
+        now = time.monotonic()
+        _anonymous_created_total += 1
+        _anonymous_created_recent.append(now)
+        while _anonymous_created_recent and _anonymous_created_recent[0] <= now - 60:
+            _anonymous_created_recent.popleft()
+
+    return response
+
+
+def get_anonymous_user_stats() -> Dict[str, int]:
+    """Anonymous users created since start-up and in the last minute."""
+    cutoff = time.monotonic() - 60
+    while _anonymous_created_recent and _anonymous_created_recent[0] <= cutoff:
+        _anonymous_created_recent.popleft()
+
+    return {
+        "anonymous_users_created": _anonymous_created_total,
+        "anonymous_users_last_minute": len(_anonymous_created_recent)
+    }
+
+
+async def create_anonymous_user() -> AnonymousAuthResponse:
     """
     Create an anonymous user using Supabase anonymous auth.
     
     Returns:
         AnonymousAuthResponse with user_id and tokens
     """
-    supabase = get_supabase_client()
-    
-    # Create anonymous user
-    response = supabase.auth.sign_in_anonymously()
+    response = await _sign_in_anonymously()
     
     if not response.user or not response.session:
         raise Exception("Failed to create anonymous user")
@@ -35,9 +73,29 @@ def create_anonymous_user() -> AnonymousAuthResponse:
     )
 
 
-def _build_user_from_token(access_token: str) -> User:
+async def _build_user_from_claims(access_token: str) -> User:
+    claims = await tokens.verify_access_token(access_token)
+
+    return User(
+        id=claims["sub"],
+        email=claims.get("email") or None,
+        is_anonymous=tokens.is_anonymous_claims(claims),
+        access_token=access_token
+    )
+
+
+async def _build_user_from_token(access_token: str) -> User:
+    if JWT_VERIFY_MODE == "local":
+        try:
+            return await _build_user_from_claims(access_token)
+        except tokens.InvalidTokenError:
+            raise Exception("Invalid access token")
+        except tokens.UnknownKeyError:
+            # Key not verifiable locally (rotation, legacy secret): ask GoTrue
+            pass
+
     supabase = get_supabase_client()
-    user_response = supabase.auth.get_user(access_token)
+    user_response = await supabase.auth.get_user(access_token)
     user = user_response.user
 
     if not user:
@@ -56,9 +114,8 @@ def _build_user_from_token(access_token: str) -> User:
     )
 
 
-def create_anonymous_session() -> Dict[str, Any]:
-    supabase = get_supabase_client()
-    response = supabase.auth.sign_in_anonymously()
+async def create_anonymous_session() -> Dict[str, Any]:
+    response = await _sign_in_anonymously()
 
     if not response.user or not response.session:
         raise Exception("Failed to create anonymous session")
@@ -76,9 +133,25 @@ def create_anonymous_session() -> Dict[str, Any]:
     }
 
 
-def refresh_access_session(refresh_token: str) -> Dict[str, Any]:
+# Refresh tokens rotate on use: concurrent requests carrying the same
+# one share a single upstream refresh, and requests arriving shortly
+# after reuse its result instead of failing with a spent token.
+_refresh_stats = register_cache_stats("token_refresh")
+_refreshed_sessions = LRUCache(
+    TOKEN_REFRESH_CACHE_SIZE,
+    TOKEN_REFRESH_CACHE_TTL,
+    stats=_refresh_stats
+)
+_refresh_flight = SingleFlight(_refresh_stats)
+
+
+def _refresh_key(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+async def _refresh_upstream(refresh_token: str, key: str) -> Dict[str, Any]:
     supabase = get_supabase_client()
-    response = supabase.auth.refresh_session(refresh_token)
+    response = await supabase.auth.refresh_session(refresh_token)
 
     if not response.session:
         raise Exception("Failed to refresh session")
@@ -86,37 +159,73 @@ def refresh_access_session(refresh_token: str) -> Dict[str, Any]:
     access_token = response.session.access_token
     new_refresh_token = response.session.refresh_token
 
-    return {
-        "user": _build_user_from_token(access_token),
+    session = {
+        "user": await _build_user_from_token(access_token),
         "access_token": access_token,
         "refresh_token": new_refresh_token,
         "set_cookies": True
     }
+    _refreshed_sessions.set(key, session)
+    return session
+
+
+async def refresh_access_session(refresh_token: str) -> Dict[str, Any]:
+    """
+    Exchange a refresh token for a new session.
+    At most one upstream refresh runs per refresh token.
+    """
+    key = _refresh_key(refresh_token)
+
+    found, session = _refreshed_sessions.get(key)
+    if not found:
+        session = await _refresh_flight.do(
+            key,
+            lambda: _refresh_upstream(refresh_token, key)
+        )
 
+    return dict(session)
 
-def resolve_session(
+
+async def resolve_session(
     access_token: Optional[str],
-    refresh_token: Optional[str]
+    refresh_token: Optional[str],
+    create_anonymous: bool = False
 ) -> Dict[str, Any]:
+    """
+    Resolve the caller's session from its tokens.
+
+    Without usable tokens a new anonymous user is only created when
+    create_anonymous is set (write paths); otherwise the session has no
+    user, so page views and crawlers do not mint GoTrue users.
+    """
     if access_token:
         try:
             return {
-                "user": _build_user_from_token(access_token),
+                "user": await _build_user_from_token(access_token),
                 "access_token": access_token,
                 "refresh_token": refresh_token,
                 "set_cookies": False
             }
         except Exception:
             if refresh_token:
-                return refresh_access_session(refresh_token)
+                return await refresh_access_session(refresh_token)
 
     if refresh_token:
         try:
-            return refresh_access_session(refresh_token)
+            return await refresh_access_session(refresh_token)
         except Exception:
-            return create_anonymous_session()
+            if not create_anonymous:
+                raise
 
-    return create_anonymous_session()
+    if create_anonymous:
+        return await create_anonymous_session()
+
+    return {
+        "user": None,
+        "access_token": None,
+        "refresh_token": None,
+        "set_cookies": False
+    }
 
 
 def apply_session_cookies(
@@ -144,7 +253,7 @@ def apply_session_cookies(
     )
 
 
-def refresh_token(refresh_token: str) -> dict:
+async def refresh_token(refresh_token: str) -> dict:
     """
     Refresh an access token using a refresh token.
     
@@ -154,13 +263,9 @@ def refresh_token(refresh_token: str) -> dict:
     Returns:
         New session data with access_token and refresh_token
     """
-    supabase = get_supabase_client()
-    response = supabase.auth.refresh_session(refresh_token)
-    
-    if not response.session:
-        raise Exception("Failed to refresh token")
+    session = await refresh_access_session(refresh_token)
     
     return {
-        "access_token": response.session.access_token,
-        "refresh_token": response.session.refresh_token
+        "access_token": session["access_token"],
+        "refresh_token": session["refresh_token"]
     }
@@ -0,0 +1,81 @@
+"""In-process fan-out of room events to Server-Sent Events subscribers."""
+import asyncio
+from typing import Any, Dict, Set, Tuple
+from ..config import SSE_MAX_CONNECTIONS, SSE_QUEUE_SIZE
+
+
+Channel = Tuple[str, str]
+
+
+class TooManySubscribers(Exception):
+    """The worker already serves SSE_MAX_CONNECTIONS streams."""
+
+
+class RoomEventHub:
+    """
+    Fan-out hub keyed by (room_id, daily_question_id).
+
+    Each subscriber gets a bounded queue; publishing never blocks, and a
+    subscriber that falls behind simply misses events (the stream sends
+    the full status on every event, so the latest one is enough).
+    """
+
+    def __init__(self, max_connections: int = SSE_MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self._channels: Dict[Channel, Set[asyncio.Queue]] = {}
+        self._connections = 0
+
+    def subscribe(self, room_id: str, daily_question_id: str) -> asyncio.Queue:
+        if self._connections >= self.max_connections:
+            raise TooManySubscribers("Too many open event streams")
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        self._channels.setdefault((room_id, daily_question_id), set()).add(queue)
+        self._connections += 1
+        return queue
+
+    def unsubscribe(self, room_id: str, daily_question_id: str, queue: asyncio.Queue) -> None:
+        channel = (room_id, daily_question_id)
+        subscribers = self._channels.get(channel)
+        if not subscribers or queue not in subscribers:
+            return
+
+        subscribers.discard(queue)
+        self._connections -= 1
+        if not subscribers:
+            del self._channels[channel]
+
+    def publish(self, room_id: str, daily_question_id: str, event: Dict[str, Any]) -> int:
+        """
+        Deliver an event to every subscriber of a channel.
+
+        Returns:
+            Number of subscribers the event was queued for
+        """
+        delivered = 0
+        for queue in self._channels.get((room_id, daily_question_id), ()):
+            try:
+                queue.put_nowait(event)
+                delivered += 1
+            except asyncio.QueueFull:
+                continue
+        return delivered
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "connections": self._connections,
+            "channels": len(self._channels),
+            "max_connections": self.max_connections
+        }
+
+
+hub = RoomEventHub()
+
+
+def publish_response(room_id: str, daily_question_id: str, user_id: str) -> int:
+    """Notify subscribers that a participant answered."""
+    return hub.publish(
+        room_id,
+        daily_question_id,
+        {"type": "response", "user_id": user_id}
+    )
@@ -1,51 +1,272 @@
 """Question service for fetching daily questions."""
-from datetime import date
-from typing import List
-from ..utils.supabase import get_supabase_client
-from ..models import DailyQuestionResponse, QuestionOption
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import Dict, Optional, Tuple
+from ..repositories import get_repository
+from ..utils.cache import LRUCache, SingleFlight, register_cache_stats
+from ..utils.dates import (
+    default_timezone,
+    next_rollover,
+    resolve_timezone,
+    seconds_since_rollover,
+    timezone_name,
+    today_in
+)
+from ..models import (
+    AnswerDistributionResponse,
+    DailyQuestionResponse,
+    OptionDistribution,
+    QuestionOption
+)
+from ..config import (
+    DEBUG,
+    DAILY_QUESTION_CACHE_TTL,
+    DAILY_QUESTION_FETCH_TIMEOUT,
+    DAILY_QUESTION_STALE_GRACE,
+    ANSWER_DISTRIBUTION_CACHE_TTL,
+    QUESTION_PREWARM_LEAD,
+    QUESTION_TIMEZONES,
+    MAX_TRACKED_TIMEZONES
+)
 
 
-def get_today_daily_question() -> DailyQuestionResponse:
+# Cached questions by date: date -> (question, fetched_at)
+_cache: Dict[date, Tuple[DailyQuestionResponse, float]] = {}
+_stats = register_cache_stats("daily_question")
+_flight = SingleFlight(_stats)
+
+# Answer distribution by daily question id; a handful of days are live at once
+_distribution_stats = register_cache_stats("answer_distribution")
+_distribution_cache = LRUCache(16, ANSWER_DISTRIBUTION_CACHE_TTL, stats=_distribution_stats)
+_distribution_flight = SingleFlight(_distribution_stats)
+
+# Timezones whose midnight the rollover scheduler prepares for
+_tracked_timezones: Dict[str, tzinfo] = {}
+
+
+async def _fetch_daily_question(day: date) -> DailyQuestionResponse:
+    question = await get_repository().get_daily_question(day)
+
+    if not question:
+        raise Exception("No question available for today")
+
+    return DailyQuestionResponse(
+        id=question["id"],
+        text=question["text"],
+        intensity_level=question["intensity_level"],
+        options=[QuestionOption(**opt) for opt in question["options"]]
+    )
+
+
+async def _fetch_and_store(day: date) -> DailyQuestionResponse:
+    question = await _fetch_daily_question(day)
+    _cache[day] = (question, time.monotonic())
+
+    # Local dates across all timezones span at most two days either side
+    reference_day = today_in()
+    for cached_day in list(_cache):
+        if abs((cached_day - reference_day).days) > 2:
+            _cache.pop(cached_day, None)
+
+    return question
+
+
+def _stale_entry(day: date, tz: tzinfo) -> Optional[DailyQuestionResponse]:
+    """
+    Entry that may be served while a refresh is slow: today's soft-expired
+    entry, or yesterday's for a short grace period after the rollover.
+    """
+    entry = _cache.get(day)
+    if entry:
+        return entry[0]
+
+    previous = _cache.get(day - timedelta(days=1))
+    if previous and seconds_since_rollover(tz) < DAILY_QUESTION_STALE_GRACE:
+        return previous[0]
+    return None
+
+
+async def get_daily_question(
+    day: date,
+    tz: Optional[tzinfo] = None
+) -> DailyQuestionResponse:
+    """
+    Get the daily question for a date, served from the in-process cache.
+
+    Entries are keyed by date, so they expire exactly at the day boundary.
+    Concurrent misses share a single upstream fetch; if a refresh is slower
+    than DAILY_QUESTION_FETCH_TIMEOUT and a stale entry exists, the stale
+    entry is served while the fetch completes in the background.
+    """
+    now = time.monotonic()
+    entry = _cache.get(day)
+    if entry and now - entry[1] < DAILY_QUESTION_CACHE_TTL:
+        _stats.incr("hits")
+        return entry[0]
+
+    _stats.incr("misses")
+    task = _flight.task(day, lambda: _fetch_and_store(day))
+
+    stale = _stale_entry(day, tz or default_timezone())
+    if stale is None:
+        return await asyncio.shield(task)
+
+    try:
+        return await asyncio.wait_for(
+            asyncio.shield(task),
+            timeout=DAILY_QUESTION_FETCH_TIMEOUT
+        )
+    except Exception:
+        _stats.incr("stale_hits")
+        return stale
+
+
+async def get_today_daily_question(tz: Optional[tzinfo] = None) -> DailyQuestionResponse:
     """
     Get today's daily question with options.
-    
+
+    Args:
+        tz: Timezone defining "today" (defaults to APP_TIMEZONE)
+
     Returns:
         DailyQuestionResponse with question text and options
-        
+
     Raises:
         Exception if no question exists for today
     """
-    supabase = get_supabase_client()
-    today = date.today()
-    
-    # Fetch daily question with related question and options
-    result = supabase.table("daily_questions")\
-        .select("""
-            id,
-            questions!inner(
-                text,
-                intensity_level,
-                options(id, text, position)
-            )
-        """)\
-        .eq("date", str(today))\
-        .single()\
-        .execute()
-    
-    if not result.data:
-        raise Exception("No question available for today")
-    
-    question_data = result.data["questions"]
-    
-    # Sort options by position
-    options = sorted(
-        question_data["options"],
-        key=lambda x: x["position"]
+    tz = tz or default_timezone()
+    track_timezone(tz)
+    return await get_daily_question(today_in(tz), tz)
+
+
+def _percent(count: int, total: int) -> float:
+    return round(100 * count / total, 1) if total else 0.0
+
+
+async def _fetch_answer_distribution(question: DailyQuestionResponse) -> AnswerDistributionResponse:
+    rows = await get_repository().get_answer_distribution(question.id)
+    counts = {row["option_id"]: row for row in rows}
+
+    # Every answer picks one option for each side, so both columns share a total
+    total = sum(row["self_count"] for row in rows)
+
+    options = []
+    for option in question.options:
+        row = counts.get(option.id, {})
+        self_count = row.get("self_count", 0)
+        prediction_count = row.get("prediction_count", 0)
+        options.append(OptionDistribution(
+            option_id=option.id,
+            self_count=self_count,
+            self_percent=_percent(self_count, total),
+            prediction_count=prediction_count,
+            prediction_percent=_percent(prediction_count, total)
+        ))
+
+    distribution = AnswerDistributionResponse(
+        daily_question_id=question.id,
+        total_answers=total,
+        options=options
     )
-    
-    return DailyQuestionResponse(
-        id=result.data["id"],
-        text=question_data["text"],
-        intensity_level=question_data["intensity_level"],
-        options=[QuestionOption(**opt) for opt in options]
+    _distribution_cache.set(question.id, distribution)
+    return distribution
+
+
+async def get_today_answer_distribution(tz: Optional[tzinfo] = None) -> AnswerDistributionResponse:
+    """
+    Get how all rooms answered today's question, option by option.
+
+    Counters are kept per option by a trigger on responses, so the upstream
+    read does not depend on how many answers exist. The result is shared
+    by every caller and cached for ANSWER_DISTRIBUTION_CACHE_TTL seconds;
+    concurrent misses share one upstream call.
+
+    Raises:
+        Exception if no question exists for today
+    """
+    question = await get_today_daily_question(tz)
+
+    found, distribution = _distribution_cache.get(question.id)
+    if found:
+        return distribution
+
+    return await _distribution_flight.do(
+        question.id,
+        lambda: _fetch_answer_distribution(question)
     )
+
+
+def track_timezone(tz: tzinfo) -> None:
+    """Register a timezone so its next rollover gets pre-warmed."""
+    name = timezone_name(tz)
+    if name not in _tracked_timezones and len(_tracked_timezones) < MAX_TRACKED_TIMEZONES:
+        _tracked_timezones[name] = tz
+
+
+async def prewarm_daily_question(day: date) -> Optional[DailyQuestionResponse]:
+    """
+    Load a day's question (and its options) into the cache ahead of time.
+    Skipped when the entry was fetched within the pre-warm window.
+    """
+    entry = _cache.get(day)
+    if entry and time.monotonic() - entry[1] < QUESTION_PREWARM_LEAD:
+        return entry[0]
+
+    _stats.incr("prewarms")
+    return await _flight.do(day, lambda: _fetch_and_store(day))
+
+
+async def run_rollover_scheduler() -> None:
+    """
+    Background task pre-warming the next day's question before each
+    tracked timezone's midnight.
+
+    The cache is keyed by date, so once tomorrow's entry is stored the
+    switch at the boundary is atomic: the first lookup for the new date
+    is already a hit.
+    """
+    for name in QUESTION_TIMEZONES:
+        track_timezone(resolve_timezone(name))
+    track_timezone(default_timezone())
+
+    try:
+        await prewarm_daily_question(today_in())
+    except Exception as e:
+        if DEBUG:
+            print(f"[DEBUG] Initial question pre-warm failed: {str(e)}")
+
+    while True:
+        now = datetime.now(timezone.utc)
+        tz = min(_tracked_timezones.values(), key=lambda z: next_rollover(z, now))
+        boundary = next_rollover(tz, now)
+
+        wait = (boundary - now).total_seconds() - QUESTION_PREWARM_LEAD
+        if wait > 0:
+            # Wake up at least hourly to pick up newly tracked timezones
+            await asyncio.sleep(min(wait, 3600))
+            continue
+
+        upcoming_day = boundary.astimezone(tz).date()
+        try:
+            await prewarm_daily_question(upcoming_day)
+        except Exception as e:
+            if DEBUG:
+                print(f"[DEBUG] Question pre-warm for {upcoming_day} failed: {str(e)}")
+
+        # Let the boundary pass before planning the next one
+        remaining = (boundary - datetime.now(timezone.utc)).total_seconds()
+        await asyncio.sleep(max(remaining, 0) + 1)
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Daily question cache counters plus its size, reported by /health."""
+    stats = _stats.snapshot()
+    stats["entries"] = len(_cache)
+    stats["tracked_timezones"] = len(_tracked_timezones)
+    return stats
+
+
+def clear_cache() -> None:
+    _cache.clear()
+    _distribution_cache.clear()
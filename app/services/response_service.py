@@ -1,63 +1,70 @@
 """Response service for handling user responses and streak calculation."""
+import base64
+import json
 from datetime import date, timedelta
-from collections import defaultdict
-from typing import List, Dict, Any
-from ..utils.supabase import get_supabase_client, get_supabase_authed_client
-from ..models import ResponseCreate, ResponseSubmitResult, StreakResponse
-from ..config import ALLOW_SERVICE_ROLE_FALLBACK
+from typing import List, Dict, Any, Set, Optional, Tuple, AsyncIterator
+from ..repositories import HistoryCursor, get_repository
+from ..utils.dates import today_in
+from . import room_service, event_service
+from ..models import (
+    ResponseCreate,
+    ResponseSubmitResult,
+    StreakResponse,
+    RoomStatsResponse,
+    UserPredictionStats
+)
+from ..config import ROOM_HISTORY_PAGE_SIZE, ROOM_HISTORY_MAX_PAGE_SIZE
 
 
-def _get_authed_client(access_token: str):
-    return get_supabase_authed_client(access_token)
-
-
-def submit_response(
+async def submit_response(
     response_data: ResponseCreate,
     user_id: str,
     access_token: str
 ) -> ResponseSubmitResult:
     """
     Submit a user's response to a daily question.
-    
+
+    Uses the submit_response RPC, which validates the options, enforces
+    room capacity, inserts and returns the room's answer count for the
+    day in a single round trip.
+
     Args:
         response_data: Response data (room_id, question_id, options)
         user_id: Current user's ID
-        
+
     Returns:
-        ResponseSubmitResult with response_id
-        
+        ResponseSubmitResult with response_id and answer status
+
     Raises:
         Exception if submission fails or user already answered
     """
-    supabase = _get_authed_client(access_token)
-    
-    payload = {
-        "room_id": response_data.room_id,
-        "user_id": user_id,
-        "daily_question_id": response_data.daily_question_id,
-        "self_option_id": response_data.self_option_id,
-        "partner_prediction_option_id": response_data.partner_prediction_option_id
+    params = {
+        "p_room_id": response_data.room_id,
+        "p_daily_question_id": response_data.daily_question_id,
+        "p_self_option_id": response_data.self_option_id,
+        "p_partner_prediction_option_id": response_data.partner_prediction_option_id
     }
-    
+
     try:
-        try:
-            result = supabase.table("responses").insert(payload).execute()
-        except Exception as e:
-            error_msg = str(e)
-            if "row-level security" in error_msg and ALLOW_SERVICE_ROLE_FALLBACK:
-                # Fallback to service role for insert after JWT validation.
-                supabase_sr = get_supabase_client(use_service_role=True)
-                result = supabase_sr.table("responses").insert(payload).execute()
-            else:
-                raise
-
-        if not result.data:
+        result = await get_repository().submit_response(params, access_token)
+
+        if not result:
             raise Exception("Failed to submit response")
 
+        # The insert may have advanced the room's streak
+        room_service.invalidate_room(response_data.room_id)
+        event_service.publish_response(
+            response_data.room_id,
+            response_data.daily_question_id,
+            user_id
+        )
+
         return ResponseSubmitResult(
             status="ok",
-            response_id=result.data[0]["id"],
-            message="Response submitted successfully"
+            response_id=result["response_id"],
+            message="Response submitted successfully",
+            answer_count=result["answer_count"],
+            both_answered=result["both_answered"]
         )
     except Exception as e:
         error_msg = str(e)
@@ -66,53 +73,107 @@ def submit_response(
         raise Exception(f"Failed to submit response: {error_msg}")
 
 
-def get_room_responses(
+def encode_cursor(response: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing after a response row."""
+    raw = json.dumps([response["created_at"], response["id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> HistoryCursor:
+    try:
+        created_at, response_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(created_at), str(response_id)
+    except Exception:
+        raise Exception("Invalid cursor")
+
+
+async def _fetch_room_responses_page(
     room_id: str,
-    user_id: str,
+    limit: int,
+    cursor: Optional[str],
     access_token: str
-) -> List[Dict[str, Any]]:
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    after = decode_cursor(cursor) if cursor else None
+
+    # One extra row tells us whether there is a next page
+    rows = await get_repository().get_room_responses_page(
+        room_id, limit + 1, after, access_token
+    )
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+async def ensure_room_participant(room_id: str, user_id: str, access_token: str) -> None:
+    """
+    Raises:
+        Exception if user is not a participant in the room
+    """
+    if not await get_repository().is_room_participant(room_id, user_id, access_token):
+        raise Exception("You are not a participant in this room")
+
+
+async def get_room_responses(
+    room_id: str,
+    user_id: str,
+    access_token: str,
+    limit: int = ROOM_HISTORY_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    Get all responses for a room.
+    Get a page of a room's responses, newest first.
     User must be a participant in the room.
-    
+
+    Pages are keyset-paginated on (created_at, id), so the cost of a page
+    does not depend on how old the room is.
+
+    RLS only returns a room's responses to its participants, so a
+    non-empty page already proves membership; room_participants is only
+    checked when a page is empty, with or without a cursor (members who
+    have not answered yet get an empty history, not an error).
+
     Args:
         room_id: Room UUID
         user_id: Current user's ID (for authorization)
-        
+        limit: Page size (capped at ROOM_HISTORY_MAX_PAGE_SIZE)
+        cursor: next_cursor from the previous page
+
     Returns:
-        List of response dictionaries with user and option details
-        
+        Dictionary with the page of responses and next_cursor (None on
+        the last page)
+
     Raises:
         Exception if user is not a participant
     """
-    supabase = _get_authed_client(access_token)
-    
-    # Verify user is a participant
-    check = supabase.table("responses")\
-        .select("id")\
-        .eq("room_id", room_id)\
-        .eq("user_id", user_id)\
-        .limit(1)\
-        .execute()
-    
-    if not check.data:
-        raise Exception("You are not a participant in this room")
-    
-    # Fetch all responses with joined data
-    responses = supabase.table("responses")\
-        .select("""
-            *,
-            self_option:options!self_option_id(text),
-            prediction_option:options!partner_prediction_option_id(text)
-        """)\
-        .eq("room_id", room_id)\
-        .order("created_at", desc=True)\
-        .execute()
-    
-    return responses.data if responses.data else []
+    limit = max(1, min(limit, ROOM_HISTORY_MAX_PAGE_SIZE))
+
+    rows, next_cursor = await _fetch_room_responses_page(room_id, limit, cursor, access_token)
+
+    if not rows:
+        await ensure_room_participant(room_id, user_id, access_token)
+
+    return {"responses": rows, "next_cursor": next_cursor}
 
 
-def get_daily_question_responses(
+async def iter_room_responses(
+    room_id: str,
+    access_token: str,
+    cursor: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield a room's responses page by page, newest first, for exports.
+    Only one page is held in memory at a time.
+    """
+    while True:
+        rows, cursor = await _fetch_room_responses_page(
+            room_id, ROOM_HISTORY_MAX_PAGE_SIZE, cursor, access_token
+        )
+        for row in rows:
+            yield row
+        if not cursor:
+            break
+
+
+async def get_daily_question_responses(
     room_id: str,
     daily_question_id: str,
     user_id: str,
@@ -121,80 +182,119 @@ def get_daily_question_responses(
     """
     Get responses for a room and daily question.
     User must be a participant in the room.
-    """
-    supabase = _get_authed_client(access_token)
 
-    # Verify user is a participant
-    check = supabase.table("responses")\
-        .select("id")\
-        .eq("room_id", room_id)\
-        .eq("user_id", user_id)\
-        .limit(1)\
-        .execute()
+    A single RPC returns the responses together with the participation
+    flag, since a participant may not have answered this day yet.
+    """
+    result = await get_repository().get_daily_question_responses(
+        room_id,
+        daily_question_id,
+        access_token
+    )
 
-    if not check.data:
+    if not result or not result.get("is_participant"):
         raise Exception("You are not a participant in this room")
 
-    responses = supabase.table("responses")\
-        .select("""
-            *,
-            self_option:options!self_option_id(text),
-            prediction_option:options!partner_prediction_option_id(text)
-        """)\
-        .eq("room_id", room_id)\
-        .eq("daily_question_id", daily_question_id)\
-        .order("created_at", desc=False)\
-        .execute()
+    return result["responses"]
 
-    return responses.data if responses.data else []
 
-
-def calculate_streak(room_id: str, access_token: str) -> StreakResponse:
+async def calculate_streak(room_id: str, access_token: str) -> StreakResponse:
     """
-    Calculate current streak for a room.
+    Get the current streak for a room.
     Streak = consecutive days where both participants answered.
-    
+
+    The count is maintained by the update_room_streak trigger when the
+    second participant answers, so this is a single row read. A streak
+    whose last completed day is before yesterday has been broken.
+
     Args:
         room_id: Room UUID
-        
+
     Returns:
         StreakResponse with current streak count
     """
-    supabase = _get_authed_client(access_token)
-    
-    # Fetch responses from last 60 days
-    today = date.today()
-    start_date = today - timedelta(days=60)
-    
-    responses = supabase.table("responses")\
-        .select("daily_question_id, user_id, created_at")\
-        .eq("room_id", room_id)\
-        .gte("created_at", start_date.isoformat())\
-        .execute()
-    
-    if not responses.data:
+    room = await get_repository().get_room_streak(room_id, access_token)
+
+    if not room:
         return StreakResponse(streak=0, room_id=room_id)
-    
-    # Group responses by daily_question_id (each represents one day)
-    days = defaultdict(set)
-    for r in responses.data:
-        days[r["daily_question_id"]].add(r["user_id"])
-    
-    # Sort days by date (descending - most recent first)
-    sorted_days = sorted(days.keys(), reverse=True)
-    
-    # Calculate streak (consecutive days with 2+ participants)
-    streak = 0
-    for dq_id in sorted_days:
-        if len(days[dq_id]) >= 2:
-            streak += 1
-        else:
-            break  # Streak broken
-    
-    return StreakResponse(streak=streak, room_id=room_id)
+
+    last_streak_date = room.get("last_streak_date")
+    if not last_streak_date:
+        return StreakResponse(streak=0, room_id=room_id)
+
+    if date.fromisoformat(last_streak_date) < today_in() - timedelta(days=1):
+        return StreakResponse(streak=0, room_id=room_id)
+
+    return StreakResponse(streak=room["streak_count"], room_id=room_id)
+
+
+async def get_room_stats(room_id: str, access_token: str) -> RoomStatsResponse:
+    """
+    Get how well each participant predicts the other.
+
+    Reads the room_stats rows kept up to date by the update_room_stats
+    trigger when the second participant answers, so the cost does not
+    depend on the room's history. Rolling accuracy covers the last 30
+    days both answered.
+
+    Args:
+        room_id: Room UUID
+
+    Returns:
+        RoomStatsResponse (empty for rooms without a completed day)
+    """
+    rows = await get_repository().get_room_stats(room_id, access_token)
+
+    users = []
+    for row in rows:
+        days = row["days_both_answered"]
+        recent = row.get("recent_results") or []
+        users.append(UserPredictionStats(
+            user_id=row["user_id"],
+            correct_predictions=row["correct_predictions"],
+            accuracy=round(row["correct_predictions"] / days, 4) if days else 0.0,
+            rolling_accuracy=round(sum(recent) / len(recent), 4) if recent else 0.0,
+            rolling_days=len(recent)
+        ))
+
+    return RoomStatsResponse(
+        room_id=room_id,
+        days_both_answered=max((row["days_both_answered"] for row in rows), default=0),
+        users=users
+    )
+
+
+def build_answer_status(
+    room_id: str,
+    daily_question_id: str,
+    user_id: str,
+    answered_user_ids: Set[str]
+) -> Dict[str, Any]:
+    """Answer status payload shared by the status endpoint and event stream."""
+    count = len(answered_user_ids)
+    return {
+        "both_answered": count >= 2,
+        "user_answered": user_id in answered_user_ids,
+        "answer_count": count,
+        "room_id": room_id,
+        "daily_question_id": daily_question_id
+    }
 
 
-def check_both_answered(
+async def get_answered_user_ids(
+    room_id: str,
+    daily_question_id: str,
+    access_token: str
+) -> Set[str]:
+    """Ids of the users who answered a daily question in a room."""
+    return await get_repository().get_answered_user_ids(
+        room_id,
+        daily_question_id,
+        access_token
+    )
+
+
+async def check_both_answered(
     room_id: str,
     daily_question_id: str,
     user_id: str,
@@ -210,23 +310,36 @@ def check_both_answered(
     Returns:
         Dictionary with status and count of answers
     """
-    supabase = _get_authed_client(access_token)
-    
-    responses = supabase.table("responses")\
-        .select("user_id")\
-        .eq("room_id", room_id)\
-        .eq("daily_question_id", daily_question_id)\
-        .execute()
-    
-    count = len(responses.data) if responses.data else 0
-    user_answered = False
-    if responses.data:
-        user_answered = any(r["user_id"] == user_id for r in responses.data)
-    
-    return {
-        "both_answered": count >= 2,
-        "user_answered": user_answered,
-        "answer_count": count,
-        "room_id": room_id,
-        "daily_question_id": daily_question_id
-    }
+    answered = await get_answered_user_ids(room_id, daily_question_id, access_token)
+    return build_answer_status(room_id, daily_question_id, user_id, answered)
+
+
+async def get_room_state(
+    room_id: str,
+    daily_question_id: str,
+    access_token: str
+) -> Dict[str, Any]:
+    """
+    Get everything the question page needs in one round trip.
+
+    Backed by the get_room_state RPC: answer status, both responses with
+    option texts, prediction matches and the current streak.
+
+    Args:
+        room_id: Room UUID
+        daily_question_id: Daily question UUID
+
+    Returns:
+        Dictionary with the aggregated room state
+    """
+    result = await get_repository().get_room_state(
+        room_id,
+        daily_question_id,
+        today_in(),
+        access_token
+    )
+
+    if not result:
+        raise Exception("Failed to load room state")
+
+    return result
@@ -1,37 +1,216 @@
 """Room service for business logic."""
+import asyncio
 import os
-from typing import Dict, Any
-from ..utils.supabase import get_supabase_client
-from ..models import RoomResponse, RoomByTokenResponse
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, Any, Optional, Tuple
+from ..repositories import get_repository
+from ..utils.cache import LRUCache, register_cache_stats
+from ..models import RoomResponse, RoomByTokenResponse, RoomJoinResponse
+from ..config import (
+    DEBUG,
+    ROOM_CACHE_SIZE,
+    ROOM_CACHE_TTL,
+    ROOM_NEGATIVE_CACHE_TTL,
+    ROOM_POOL_SIZE,
+    ROOM_POOL_LOW_WATER,
+    ROOM_POOL_REFILL_INTERVAL,
+    ROOM_POOL_MAX_AGE,
+    ROOM_POOL_CLEANUP_INTERVAL
+)
 
 
-def create_room() -> RoomResponse:
+# Room rows keyed by ("id", room_id) and ("token", token)
+_rooms = LRUCache(
+    maxsize=ROOM_CACHE_SIZE,
+    ttl=ROOM_CACHE_TTL,
+    negative_ttl=ROOM_NEGATIVE_CACHE_TTL,
+    stats=register_cache_stats("rooms")
+)
+
+# Pre-created, unclaimed rooms owned by this worker, oldest first, with
+# the monotonic time they were added. They are given up after half of
+# ROOM_POOL_MAX_AGE, so cleanup_unclaimed_rooms never deletes a room a
+# worker may still hand out.
+_room_pool: Deque[Tuple[float, Dict[str, Any]]] = deque()
+_pool_low = asyncio.Event()
+_POOLED_ROOM_TTL = ROOM_POOL_MAX_AGE / 2
+
+
+def _cache_room(room: Dict[str, Any]) -> None:
+    _rooms.set(("id", room["id"]), room)
+    _rooms.set(("token", room["token"]), room)
+
+
+def invalidate_room(room_id: str, token: Optional[str] = None) -> None:
     """
-    Create a new couple room with a unique token.
-    
-    Returns:
-        RoomResponse with room details
+    Drop a room from the cache after it was updated.
+
+    Args:
+        room_id: The room UUID
+        token: The room token, if known (looked up in the cache otherwise)
     """
-    supabase = get_supabase_client(use_service_role=True)
-    
+    cached = _rooms.peek(("id", room_id))
+    if cached and not token:
+        token = cached["token"]
+
+    _rooms.pop(("id", room_id))
+    if token:
+        _rooms.pop(("token", token))
+
+
+async def _get_room(column: str, value: str) -> Optional[Dict[str, Any]]:
+    found, room = _rooms.get((column, value))
+    if found:
+        return room
+
+    room = await get_repository().get_room(column, value)
+
+    if not room:
+        # Remember misses briefly so typos and scanners do not hit the DB
+        _rooms.set_negative((column, value))
+        return None
+
+    _cache_room(room)
+    return room
+
+
+def _new_room_data() -> Dict[str, Any]:
     # Generate unique token (24 chars, uppercase hex)
     token = os.urandom(12).hex().upper()
-    
-    room_data = {
+
+    return {
         "token": token,
         "room_type": "couple",
         "max_participants": 2,
         "is_permanent": False,
         "streak_count": 0
     }
-    
-    result = supabase.table("rooms").insert(room_data).execute()
-    
-    if not result.data:
-        raise Exception("Failed to create room")
-    
-    room = result.data[0]
-    
+
+
+async def refill_room_pool() -> int:
+    """
+    Top the pre-created room pool back up to ROOM_POOL_SIZE with a single
+    batch insert. Pooled rooms stay unclaimed (claimed_at null) until a
+    session takes one.
+
+    Returns:
+        Number of rooms added
+    """
+    _expire_pooled_rooms()
+    missing = ROOM_POOL_SIZE - len(_room_pool)
+    if missing <= 0:
+        return 0
+
+    rows = [{**_new_room_data(), "claimed_at": None} for _ in range(missing)]
+
+    inserted = await get_repository().insert_rooms(rows)
+
+    added_at = time.monotonic()
+    _room_pool.extend((added_at, room) for room in inserted)
+    return len(inserted)
+
+
+def _expire_pooled_rooms() -> None:
+    # Expired rooms stay unclaimed in the table until the cleanup
+    expired_before = time.monotonic() - _POOLED_ROOM_TTL
+    while _room_pool and _room_pool[0][0] < expired_before:
+        _room_pool.popleft()
+
+
+async def cleanup_unclaimed_rooms() -> int:
+    """
+    Delete pooled rooms nobody claimed within ROOM_POOL_MAX_AGE, such as
+    the ones a restarted worker was holding.
+
+    Returns:
+        Number of rooms deleted
+    """
+    return await get_repository().cleanup_unclaimed_rooms(ROOM_POOL_MAX_AGE)
+
+
+async def _claim_pooled_room() -> Optional[Dict[str, Any]]:
+    repository = get_repository()
+
+    _expire_pooled_rooms()
+    while _room_pool:
+        _, room = _room_pool.popleft()
+
+        claimed = await repository.claim_room(
+            room["id"],
+            datetime.now(timezone.utc).isoformat()
+        )
+
+        if claimed:
+            return claimed
+
+    return None
+
+
+async def run_room_pool_refiller() -> None:
+    """
+    Background task keeping the room pool above ROOM_POOL_LOW_WATER.
+    Woken by create_room when the pool runs low. Also deletes stale
+    unclaimed rooms every ROOM_POOL_CLEANUP_INTERVAL.
+    """
+    cleaned_at = None
+    while True:
+        try:
+            await refill_room_pool()
+        except Exception as e:
+            if DEBUG:
+                print(f"[DEBUG] Room pool refill failed: {str(e)}")
+
+        if cleaned_at is None or time.monotonic() - cleaned_at >= ROOM_POOL_CLEANUP_INTERVAL:
+            cleaned_at = time.monotonic()
+            try:
+                await cleanup_unclaimed_rooms()
+            except Exception as e:
+                if DEBUG:
+                    print(f"[DEBUG] Room pool cleanup failed: {str(e)}")
+
+        _pool_low.clear()
+        try:
+            await asyncio.wait_for(_pool_low.wait(), timeout=ROOM_POOL_REFILL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def create_room(access_token: Optional[str] = None) -> RoomResponse:
+    """
+    Create a new couple room with a unique token.
+
+    Claims a pre-created room from the pool when one is available (one
+    update instead of an insert) and falls back to inserting a new room.
+
+    Args:
+        access_token: Creator's access token; when given, the creator is
+            added to the room's participants
+
+    Returns:
+        RoomResponse with room details
+    """
+    room = None
+    if ROOM_POOL_SIZE > 0:
+        room = await _claim_pooled_room()
+        if len(_room_pool) <= ROOM_POOL_LOW_WATER:
+            _pool_low.set()
+
+    if room is None:
+        inserted = await get_repository().insert_rooms([_new_room_data()])
+
+        if not inserted:
+            raise Exception("Failed to create room")
+
+        room = inserted[0]
+
+    _cache_room(room)
+
+    if access_token:
+        await add_participant(room["id"], access_token)
+
     return RoomResponse(
         id=room["id"],
         token=room["token"],
@@ -42,55 +221,103 @@ def create_room() -> RoomResponse:
     )
 
 
-def get_room_by_token(token: str) -> RoomByTokenResponse:
+def get_room_pool_stats() -> Dict[str, int]:
+    return {
+        "available": len(_room_pool),
+        "size": ROOM_POOL_SIZE,
+        "low_water": ROOM_POOL_LOW_WATER
+    }
+
+
+async def get_room_by_token(token: str) -> RoomByTokenResponse:
     """
     Get room details by token (used for joining).
-    
+
     Args:
         token: The room token
-        
+
     Returns:
         RoomByTokenResponse with room details
-        
+
     Raises:
         Exception if token is invalid
     """
-    supabase = get_supabase_client()
-    
-    result = supabase.table("rooms")\
-        .select("id, token, room_type, is_permanent, max_participants")\
-        .eq("token", token)\
-        .single()\
-        .execute()
-    
-    if not result.data:
+    room = await _get_room("token", token)
+
+    if not room:
+        raise Exception("Invalid room token")
+
+    return RoomByTokenResponse(
+        id=room["id"],
+        token=room["token"],
+        room_type=room["room_type"],
+        is_permanent=room["is_permanent"],
+        max_participants=room["max_participants"]
+    )
+
+
+async def add_participant(room_id: str, access_token: str) -> Dict[str, Any]:
+    """
+    Add the token's user to room_participants (no-op for members).
+
+    Raises:
+        Exception if the room is full
+    """
+    return await get_repository().join_room(room_id, access_token)
+
+
+async def join_room(token: str, access_token: str) -> RoomJoinResponse:
+    """
+    Join a room by token, making the caller a participant.
+
+    Membership lets a partner read the room before answering. Joining a
+    room twice is a no-op.
+
+    Args:
+        token: The room token
+        access_token: The joining user's access token
+
+    Returns:
+        RoomJoinResponse with the room's participant count
+
+    Raises:
+        Exception if the token is invalid or the room is full
+    """
+    room = await _get_room("token", token)
+
+    if not room:
         raise Exception("Invalid room token")
-    
-    return RoomByTokenResponse(**result.data)
 
+    result = await add_participant(room["id"], access_token)
 
-def get_room_by_id(room_id: str) -> Dict[str, Any]:
+    return RoomJoinResponse(
+        room_id=room["id"],
+        participant_count=result["participant_count"],
+        max_participants=result["max_participants"]
+    )
+
+
+async def get_room_by_id(room_id: str) -> Dict[str, Any]:
     """
     Get room details by ID.
-    
+
     Args:
         room_id: The room UUID
-        
+
     Returns:
         Room data dictionary
-        
+
     Raises:
         Exception if room not found
     """
-    supabase = get_supabase_client()
-    
-    result = supabase.table("rooms")\
-        .select("*")\
-        .eq("id", room_id)\
-        .single()\
-        .execute()
-    
-    if not result.data:
+    try:
+        uuid.UUID(room_id)
+    except ValueError:
+        raise Exception("Room not found")
+
+    room = await _get_room("id", room_id)
+
+    if not room:
         raise Exception("Room not found")
-    
-    return result.data
+
+    return dict(room)
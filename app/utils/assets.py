@@ -0,0 +1,130 @@
+"""Fingerprinted, precompressed static assets."""
+import gzip
+import hashlib
+import json
+import mimetypes
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from ..config import STATIC_IMMUTABLE_MAX_AGE
+from .http import accepts_encoding
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip copies are always built
+    brotli = None
+
+
+STATIC_DIR = Path(__file__).parent.parent / "static"
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Encodings in order of preference, with the suffix of the precompressed copy
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".ico", ".json", ".txt", ".html"}
+
+
+def _fingerprinted_name(path: Path, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def build_assets(static_dir: Path = STATIC_DIR) -> Dict[str, str]:
+    """
+    Copy every static file to dist/ under a content-hashed name, next to
+    gzip (and brotli, when installed) precompressed variants, and write
+    the manifest mapping original paths to fingerprinted ones.
+
+    Returns:
+        The manifest
+    """
+    dist = static_dir / DIST_DIR
+    if dist.exists():
+        shutil.rmtree(dist)
+
+    manifest: Dict[str, str] = {}
+    for source in sorted(static_dir.rglob("*")):
+        if not source.is_file() or dist in source.parents:
+            continue
+
+        relative = source.relative_to(static_dir)
+        content = source.read_bytes()
+        target = dist / relative.parent / _fingerprinted_name(relative, content)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+
+        if source.suffix in COMPRESSIBLE_SUFFIXES:
+            # mtime=0 keeps the output byte-identical between builds
+            target.with_name(target.name + ".gz").write_bytes(
+                gzip.compress(content, compresslevel=9, mtime=0)
+            )
+            if brotli is not None:
+                target.with_name(target.name + ".br").write_bytes(
+                    brotli.compress(content, quality=11)
+                )
+
+        manifest[relative.as_posix()] = target.relative_to(static_dir).as_posix()
+
+    (dist / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+@lru_cache(maxsize=1)
+def load_manifest() -> Dict[str, str]:
+    """Manifest written by build_assets (empty if assets were not built)."""
+    try:
+        return json.loads((STATIC_DIR / DIST_DIR / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def static_url(path: str) -> str:
+    """URL of a static file, fingerprinted when a build is available."""
+    return "/static/" + load_manifest().get(path, path)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves fingerprinted files from dist/ with immutable
+    cache headers, picking the precompressed variant the client accepts.
+    Other files are served as usual (revalidated through ETag).
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if not path.startswith(DIST_DIR + "/") or path.endswith(MANIFEST_NAME):
+            return await super().get_response(path, scope)
+
+        accepted = Headers(scope=scope).get("accept-encoding", "")
+        response = None
+        for encoding, suffix in ENCODINGS:
+            if not accepts_encoding(accepted, encoding):
+                continue
+            _, stat_result = self.lookup_path(path + suffix)
+            if stat_result is None:
+                continue
+
+            response = await super().get_response(path + suffix, scope)
+            # The compressed copy keeps the original file's media type
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            if media_type.startswith("text/"):
+                media_type += "; charset=utf-8"
+            response.headers["content-type"] = media_type
+            response.headers["content-encoding"] = encoding
+            break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            response.headers["cache-control"] = (
+                f"public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable"
+            )
+            response.headers.add_vary_header("Accept-Encoding")
+        return response
@@ -0,0 +1,144 @@
+"""In-process caching helpers shared by the services."""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class CacheStats:
+    """Plain hit/miss counters for a named cache."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counters: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "prewarms": 0,
+            "negative_hits": 0,
+            "evictions": 0
+        }
+
+    def incr(self, counter: str, amount: int = 1) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+class LRUCache:
+    """
+    Bounded LRU cache with per-entry TTL and negative entries.
+
+    ``get`` returns ``(found, value)``; a negative entry is found with a
+    value of None so callers can skip the upstream lookup for known misses.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float = 0,
+        stats: Optional[CacheStats] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = stats
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            if self.stats:
+                self.stats.incr("misses")
+            return False, None
+
+        self._entries.move_to_end(key)
+        if self.stats:
+            self.stats.incr("negative_hits" if entry[0] is None else "hits")
+        return True, entry[0]
+
+    def peek(self, key: Hashable) -> Any:
+        """Return a live value without touching LRU order or counters."""
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            if self.stats:
+                self.stats.incr("evictions")
+
+    def set_negative(self, key: Hashable) -> None:
+        if self.negative_ttl > 0:
+            self.set(key, None, self.negative_ttl)
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one upstream call.
+
+    The first caller starts the work as a task; callers arriving while it
+    is running share that task instead of issuing their own request.
+    """
+
+    def __init__(self, stats: Optional[CacheStats] = None):
+        self.stats = stats
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def task(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            if self.stats:
+                self.stats.incr("coalesced")
+            return task
+
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None and self.stats:
+            # Reading the exception also marks it retrieved for asyncio
+            self.stats.incr("errors")
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # Shield so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(self.task(key, fn))
+
+
+_registry: Dict[str, CacheStats] = {}
+
+
+def register_cache_stats(name: str) -> CacheStats:
+    """Create (or return) the stats object for a named cache."""
+    stats = _registry.get(name)
+    if stats is None:
+        stats = CacheStats(name)
+        _registry[name] = stats
+    return stats
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    return {name: stats.snapshot() for name, stats in _registry.items()}
@@ -0,0 +1,58 @@
+"""Timezone-aware helpers for the daily question boundary."""
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ..config import APP_TIMEZONE
+
+
+@lru_cache(maxsize=256)
+def _load_zone(name: str) -> Optional[tzinfo]:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def default_timezone() -> tzinfo:
+    """The app's reference timezone (server local time if not configured)."""
+    if APP_TIMEZONE:
+        zone = _load_zone(APP_TIMEZONE)
+        if zone:
+            return zone
+    return datetime.now().astimezone().tzinfo
+
+
+def resolve_timezone(name: Optional[str]) -> tzinfo:
+    """Return the zone for an IANA name, falling back to the default."""
+    if name:
+        zone = _load_zone(name.strip())
+        if zone:
+            return zone
+    return default_timezone()
+
+
+def timezone_name(tz: tzinfo) -> str:
+    return getattr(tz, "key", None) or str(tz)
+
+
+def today_in(tz: Optional[tzinfo] = None) -> date:
+    """The calendar date it currently is in a timezone."""
+    return datetime.now(tz or default_timezone()).date()
+
+
+def next_rollover(tz: tzinfo, now: Optional[datetime] = None) -> datetime:
+    """UTC instant of the next local midnight in a timezone."""
+    now = now or datetime.now(timezone.utc)
+    local_now = now.astimezone(tz)
+    next_day = local_now.date() + timedelta(days=1)
+    midnight = datetime.combine(next_day, datetime.min.time(), tzinfo=tz)
+    return midnight.astimezone(timezone.utc)
+
+
+def seconds_since_rollover(tz: tzinfo, now: Optional[datetime] = None) -> float:
+    now = now or datetime.now(timezone.utc)
+    local_now = now.astimezone(tz)
+    midnight = datetime.combine(local_now.date(), datetime.min.time(), tzinfo=tz)
+    return (local_now - midnight).total_seconds()
@@ -0,0 +1,101 @@
+"""HTTP helpers: caching validators, conditional requests and fast responses."""
+import hashlib
+from typing import Any, Optional, Union
+
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def strong_etag(body: Union[str, bytes]) -> str:
+    """Strong ETag derived from the exact response bytes."""
+    if isinstance(body, str):
+        body = body.encode()
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    True when the request's If-None-Match matches the ETag.
+
+    If-None-Match uses weak comparison, so a W/ prefix added by a proxy
+    (e.g. after on-the-fly compression) still matches.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows a content coding.
+
+    ``q=0`` refuses a coding, and ``*`` covers the codings not listed.
+    """
+    wildcard = False
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if name == encoding:
+            return quality > 0
+        if name == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+def carry_headers(target: Response, dependency_response: Optional[Response]) -> Response:
+    """
+    Copy the headers dependencies set on the injected Response (e.g. the
+    session Set-Cookie) onto a response the endpoint built itself.
+
+    FastAPI only merges them into responses it creates from a returned
+    value, so routes returning a Response object must do it explicitly.
+    """
+    if dependency_response is not None:
+        target.headers.raw.extend(
+            (name, value) for name, value in dependency_response.headers.raw
+            if name != b"content-length"
+        )
+    return target
+
+
+def json_response(
+    content: Any,
+    response: Optional[Response] = None,
+    status_code: int = 200
+) -> ORJSONResponse:
+    """JSON-native data serialized with orjson, keeping dependency headers."""
+    return carry_headers(ORJSONResponse(content, status_code=status_code), response)
+
+
+def model_response(
+    model: BaseModel,
+    response: Optional[Response] = None,
+    status_code: int = 200
+) -> ORJSONResponse:
+    """
+    Serialize a model the service just built, bypassing the route's
+    response_model re-validation (the route keeps it for the OpenAPI docs).
+
+    Pass the endpoint's injected ``Response`` so headers set by its
+    dependencies (session cookies) reach the client.
+    """
+    return json_response(model.model_dump(mode="json"), response, status_code)
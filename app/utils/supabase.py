@@ -1,29 +1,294 @@
 """Supabase client utilities."""
-from supabase import create_client, Client
-from ..config import SUPABASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
 
+import httpx
+from postgrest import AsyncPostgrestClient
+from supabase_auth import AsyncGoTrueClient
 
-def get_supabase_client(use_service_role: bool = False) -> Client:
+from ..config import (
+    SUPABASE_URL,
+    SUPABASE_ANON_KEY,
+    SUPABASE_SERVICE_ROLE_KEY,
+    SUPABASE_POOL_MAX_CONNECTIONS,
+    SUPABASE_POOL_MAX_KEEPALIVE,
+    SUPABASE_POOL_KEEPALIVE_EXPIRY,
+    SUPABASE_HTTP_TIMEOUT,
+    SUPABASE_HTTP2
+)
+from . import metrics, tracing
+
+
+REST_URL = f"{SUPABASE_URL}/rest/v1"
+AUTH_URL = f"{SUPABASE_URL}/auth/v1"
+
+
+def _api_headers(key: str, access_token: Optional[str] = None) -> Dict[str, str]:
+    return {
+        "apiKey": key,
+        "Authorization": f"Bearer {access_token or key}"
+    }
+
+
+_TABLE_VERBS = {
+    "GET": "select",
+    "HEAD": "count",
+    "POST": "insert",
+    "PATCH": "update",
+    "PUT": "upsert",
+    "DELETE": "delete"
+}
+
+_AUTH_OPERATIONS = {
+    ("GET", "user"): "auth.get_user",
+    ("POST", "signup"): "auth.sign_in_anonymously",
+    ("POST", "logout"): "auth.sign_out",
+    ("GET", ".well-known/jwks.json"): "auth.jwks"
+}
+
+
+def upstream_operation(request: httpx.Request) -> str:
+    """
+    Name a Supabase call the way the services think about it, e.g.
+    ``rooms.select``, ``rpc.submit_response`` or ``auth.refresh_session``.
+    Names only use ``[A-Za-z0-9_.-]``, so they work as metric names.
+    """
+    return tracing.metric_token(_raw_operation(request))
+
+
+def _raw_operation(request: httpx.Request) -> str:
+    path = request.url.path
+    if path.startswith("/rest/v1/"):
+        resource = path[len("/rest/v1/"):]
+        if resource.startswith("rpc/"):
+            return "rpc." + resource[len("rpc/"):]
+        return f"{resource}.{_TABLE_VERBS.get(request.method, request.method.lower())}"
+
+    if path.startswith("/auth/v1/"):
+        resource = path[len("/auth/v1/"):]
+        if resource == "token":
+            grant_type = request.url.params.get("grant_type", "")
+            if grant_type == "refresh_token":
+                return "auth.refresh_session"
+            return f"auth.token.{grant_type}"
+        return _AUTH_OPERATIONS.get((request.method, resource), "auth." + resource)
+
+    return "other"
+
+
+class _TimedStream(httpx.AsyncByteStream):
+    """Response body that reports when it has been fully read and closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            on_close, self._on_close = self._on_close, None
+            if on_close is not None:
+                on_close()
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper recording latency and outcome of every Supabase call
+    per operation, and on the current request's trace. Every client in this
+    module shares it, so all services are covered without changes.
+    """
+
+    def __init__(self, wrapped: httpx.AsyncBaseTransport):
+        self.wrapped = wrapped
+
+    def _record(self, operation: str, started: float, outcome: str) -> None:
+        duration = time.perf_counter() - started
+        metrics.upstream_request_duration.observe(duration, operation)
+        metrics.upstream_requests.inc(operation, outcome)
+        tracing.record_upstream_call(operation, duration, outcome)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        operation = upstream_operation(request)
+        started = time.perf_counter()
+        try:
+            response = await self.wrapped.handle_async_request(request)
+        except Exception as e:
+            self._record(operation, started, type(e).__name__)
+            raise
+
+        outcome = "ok" if response.status_code < 400 else f"http_{response.status_code // 100}xx"
+        response.stream = _TimedStream(
+            response.stream,
+            lambda: self._record(operation, started, outcome)
+        )
+        return response
+
+    async def aclose(self) -> None:
+        await self.wrapped.aclose()
+
+
+class PooledClient:
+    """
+    Lightweight stand-in for supabase.AsyncClient backed by shared connections.
+
+    Exposes the subset the services use (``table``, ``rpc`` and ``auth``)
+    without building storage/functions/realtime sub-clients per call.
+    Query builders and auth calls are awaitable.
+    """
+
+    def __init__(self, postgrest: AsyncPostgrestClient, auth: AsyncGoTrueClient):
+        self.postgrest = postgrest
+        self.auth = auth
+
+    def table(self, table_name: str):
+        return self.postgrest.from_(table_name)
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        return self.postgrest.rpc(fn, params or {}, **kwargs)
+
+
+class SupabaseClientRegistry:
+    """
+    Process-wide registry of Supabase clients sharing one keep-alive pool.
+
+    The anon and service-role clients are built once. Per-user clients only
+    swap the Authorization header on a new PostgREST facade, reusing the
+    same HTTP connections.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._auth: Optional[AsyncGoTrueClient] = None
+        self._clients: Dict[str, PooledClient] = {}
+        self.user_clients_created = 0
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            with self._lock:
+                if self._http_client is None:
+                    transport = httpx.AsyncHTTPTransport(
+                        limits=httpx.Limits(
+                            max_connections=SUPABASE_POOL_MAX_CONNECTIONS,
+                            max_keepalive_connections=SUPABASE_POOL_MAX_KEEPALIVE,
+                            keepalive_expiry=SUPABASE_POOL_KEEPALIVE_EXPIRY
+                        ),
+                        http2=SUPABASE_HTTP2
+                    )
+                    self._http_client = httpx.AsyncClient(
+                        transport=InstrumentedTransport(transport),
+                        timeout=SUPABASE_HTTP_TIMEOUT,
+                        follow_redirects=True
+                    )
+        return self._http_client
+
+    @property
+    def auth(self) -> AsyncGoTrueClient:
+        """
+        Shared GoTrue client. Callers must always pass tokens explicitly
+        (get_user(jwt), refresh_session(token)); it never holds a session
+        that other requests rely on.
+        """
+        if self._auth is None:
+            with self._lock:
+                if self._auth is None:
+                    self._auth = AsyncGoTrueClient(
+                        url=AUTH_URL,
+                        headers=_api_headers(SUPABASE_ANON_KEY),
+                        auto_refresh_token=False,
+                        persist_session=False,
+                        http_client=self.http_client
+                    )
+        return self._auth
+
+    def _postgrest(self, key: str, access_token: Optional[str] = None) -> AsyncPostgrestClient:
+        return AsyncPostgrestClient(
+            REST_URL,
+            headers=_api_headers(key, access_token),
+            http_client=self.http_client
+        )
+
+    def get(self, use_service_role: bool = False) -> PooledClient:
+        name = "service_role" if use_service_role else "anon"
+        client = self._clients.get(name)
+        if client is None:
+            key = SUPABASE_SERVICE_ROLE_KEY if use_service_role else SUPABASE_ANON_KEY
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = PooledClient(self._postgrest(key), self.auth)
+                    self._clients[name] = client
+        return client
+
+    def for_user(self, access_token: str) -> PooledClient:
+        self.user_clients_created += 1
+        return PooledClient(
+            self._postgrest(SUPABASE_ANON_KEY, access_token),
+            self.auth
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection pool statistics (best effort, from httpcore internals)."""
+        connections = []
+        if self._http_client is not None:
+            transport = getattr(self._http_client._transport, "wrapped", None)
+            pool = getattr(transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+
+        return {
+            "max_connections": SUPABASE_POOL_MAX_CONNECTIONS,
+            "max_keepalive_connections": SUPABASE_POOL_MAX_KEEPALIVE,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "shared_clients": sorted(self._clients.keys()),
+            "user_clients_created": self.user_clients_created
+        }
+
+    async def close(self) -> None:
+        with self._lock:
+            http_client = self._http_client
+            self._http_client = None
+            self._auth = None
+            self._clients = {}
+        if http_client is not None:
+            await http_client.aclose()
+
+
+registry = SupabaseClientRegistry()
+
+
+def get_supabase_client(use_service_role: bool = False) -> PooledClient:
     """
     Get Supabase client instance.
-    
+
     Args:
         use_service_role: If True, uses service role key (bypasses RLS).
                          If False, uses anon key (enforces RLS).
-    
+
     Returns:
-        Configured Supabase client
+        Shared client using the process-wide connection pool
     """
-    key = SUPABASE_SERVICE_ROLE_KEY if use_service_role else SUPABASE_ANON_KEY
-    return create_client(SUPABASE_URL, key)
+    return registry.get(use_service_role)
 
 
-def get_supabase_authed_client(access_token: str) -> Client:
+def get_supabase_authed_client(access_token: str) -> PooledClient:
     """
     Get Supabase client instance authenticated with a user access token.
     This ensures PostgREST receives the JWT for RLS.
     """
-    supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-    supabase.auth.set_session(access_token=access_token, refresh_token="")
-    supabase.postgrest.auth(access_token)
-    return supabase
+    return registry.for_user(access_token)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    return registry.stats()
+
+
+async def close_supabase_clients() -> None:
+    await registry.close()
@@ -0,0 +1,243 @@
+"""Local verification of Supabase access tokens."""
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+import jwt
+from supabase_auth.errors import AuthApiError
+
+from ..config import (
+    SUPABASE_URL,
+    SUPABASE_ANON_KEY,
+    SUPABASE_JWT_SECRET,
+    JWT_AUDIENCE,
+    JWT_VERIFY_MODE,
+    JWKS_CACHE_TTL,
+    JWKS_MIN_REFRESH_INTERVAL,
+    JWT_LEEWAY
+)
+from .cache import LRUCache, register_cache_stats
+from .supabase import registry
+
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+
+class InvalidTokenError(Exception):
+    """The token is malformed, expired or its signature does not match."""
+
+
+class UnknownKeyError(Exception):
+    """The token was signed with a key we cannot verify locally."""
+
+
+class JWKSCache:
+    """
+    In-memory cache of the project's JSON Web Key Set.
+
+    Keys are refreshed when the TTL expires or when a token arrives with a
+    kid we have not seen (key rotation). Refreshes triggered by unknown kids
+    are rate limited so forged kids cannot turn into a request flood.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float = JWKS_CACHE_TTL,
+        min_refresh_interval: float = JWKS_MIN_REFRESH_INTERVAL
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self, now: float) -> bool:
+        return self._fetched_at is not None and now - self._fetched_at < self.ttl
+
+    async def _refresh(self, now: float) -> None:
+        response = await registry.http_client.get(
+            self.url,
+            headers={"apikey": SUPABASE_ANON_KEY},
+            timeout=5.0
+        )
+        response.raise_for_status()
+
+        keys = {}
+        for jwk_data in response.json().get("keys", []):
+            kid = jwk_data.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwt.PyJWK(jwk_data)
+            except jwt.PyJWTError:
+                # Skip keys using algorithms we cannot handle
+                continue
+
+        self._keys = keys
+        self._fetched_at = now
+
+    async def get_key(self, kid: str) -> jwt.PyJWK:
+        """
+        Return the signing key for a kid, refreshing the set if needed.
+
+        Raises:
+            UnknownKeyError if the kid is not in the (refreshed) key set
+        """
+        now = time.monotonic()
+        key = self._keys.get(kid)
+        if key is not None and self._is_fresh(now):
+            return key
+
+        async with self._lock:
+            now = time.monotonic()
+            key = self._keys.get(kid)
+            if key is not None and self._is_fresh(now):
+                return key
+
+            recently_fetched = (
+                self._fetched_at is not None
+                and now - self._fetched_at < self.min_refresh_interval
+            )
+            if not recently_fetched:
+                try:
+                    await self._refresh(now)
+                except Exception as e:
+                    # Serve the stale set rather than failing every request
+                    if key is not None:
+                        return key
+                    raise UnknownKeyError(f"Could not fetch JWKS: {str(e)}")
+
+            key = self._keys.get(kid)
+            if key is None:
+                raise UnknownKeyError(f"No signing key for kid {kid}")
+            return key
+
+    def clear(self) -> None:
+        self._keys = {}
+        self._fetched_at = None
+
+
+_jwks_cache = JWKSCache(f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json")
+
+
+async def _get_verification_key(header: Dict[str, Any]) -> Any:
+    alg = header.get("alg")
+
+    if alg == "HS256":
+        if not SUPABASE_JWT_SECRET:
+            raise UnknownKeyError("HS256 token and no SUPABASE_JWT_SECRET configured")
+        return SUPABASE_JWT_SECRET
+
+    if alg in ASYMMETRIC_ALGORITHMS:
+        kid = header.get("kid")
+        if not kid:
+            raise UnknownKeyError("Asymmetric token without kid")
+        return await _jwks_cache.get_key(kid)
+
+    raise InvalidTokenError(f"Unsupported token algorithm: {alg}")
+
+
+async def verify_access_token(access_token: str) -> Dict[str, Any]:
+    """
+    Verify a Supabase access token without calling GoTrue.
+
+    Checks the signature against the cached JWKS (or the legacy shared
+    secret), the expiry and the audience.
+
+    Returns:
+        The token claims
+
+    Raises:
+        InvalidTokenError if the token must be rejected
+        UnknownKeyError if it cannot be verified locally
+    """
+    try:
+        header = jwt.get_unverified_header(access_token)
+    except jwt.PyJWTError as e:
+        raise InvalidTokenError(f"Malformed token: {str(e)}")
+
+    key = await _get_verification_key(header)
+
+    try:
+        claims = jwt.decode(
+            access_token,
+            key,
+            algorithms=[header["alg"]],
+            audience=JWT_AUDIENCE,
+            leeway=JWT_LEEWAY,
+            options={"require": ["exp", "sub"]}
+        )
+    except jwt.PyJWTError as e:
+        raise InvalidTokenError(str(e))
+
+    if claims.get("role") not in (None, "authenticated"):
+        raise InvalidTokenError("Token is not a user token")
+
+    return claims
+
+
+# Claims of tokens GoTrue vouched for, so remote checks run once per token
+# and minute rather than once per query
+_remote_claims = LRUCache(10000, 60, stats=register_cache_stats("remote_claims"))
+
+
+async def resolve_claims(access_token: str) -> Dict[str, Any]:
+    """
+    Claims of an access token, verified locally when possible.
+
+    Falls back to GoTrue like auth_service does when building users: with
+    JWT_VERIFY_MODE=remote, or when the signing key is not available
+    locally (unknown kid, HS256 without SUPABASE_JWT_SECRET).
+
+    Raises:
+        InvalidTokenError if the token must be rejected
+    """
+    if JWT_VERIFY_MODE == "local":
+        try:
+            return await verify_access_token(access_token)
+        except UnknownKeyError:
+            pass
+
+    key = hashlib.sha256(access_token.encode()).hexdigest()
+    found, claims = _remote_claims.get(key)
+    if found:
+        return claims
+
+    try:
+        user_response = await registry.auth.get_user(access_token)
+    except AuthApiError as e:
+        raise InvalidTokenError(f"Token rejected by GoTrue: {e.message}")
+    if not user_response or not user_response.user:
+        raise InvalidTokenError("Token rejected by GoTrue")
+
+    # GoTrue checked the signature; the payload can be read as is
+    try:
+        claims = jwt.decode(access_token, options={"verify_signature": False})
+    except jwt.PyJWTError as e:
+        raise InvalidTokenError(f"Malformed token: {str(e)}")
+
+    if claims.get("sub") != user_response.user.id:
+        raise InvalidTokenError("Token subject does not match its user")
+
+    # Never cache past the token's own expiry
+    ttl = min(_remote_claims.ttl, claims.get("exp", 0) - time.time())
+    if ttl > 0:
+        _remote_claims.set(key, claims, ttl)
+    return claims
+
+
+def is_anonymous_claims(claims: Dict[str, Any]) -> bool:
+    """Mirror the anonymous check done on GoTrue user objects."""
+    if "is_anonymous" in claims:
+        return bool(claims["is_anonymous"])
+
+    app_metadata = claims.get("app_metadata") or {}
+    return app_metadata.get("provider") == "anon" or not claims.get("email")
+
+
+def clear_jwks_cache() -> None:
+    """Drop cached signing keys (e.g. after a forced key revocation)."""
+    _jwks_cache.clear()
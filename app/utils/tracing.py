@@ -0,0 +1,81 @@
+"""Request-scoped tracing of upstream (Supabase) calls."""
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+_INVALID_TOKEN_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+_REPEATED_DOTS = re.compile(r"\.{2,}")
+
+
+def metric_token(name: str) -> str:
+    """
+    Operation name usable as a Server-Timing metric name (an HTTP token):
+    only ``[A-Za-z0-9_.-]``, without empty dot-separated parts.
+    """
+    name = _INVALID_TOKEN_CHARS.sub("_", name)
+    return _REPEATED_DOTS.sub(".", name).strip(".") or "other"
+
+
+@dataclass
+class UpstreamCall:
+    operation: str
+    duration: float
+    outcome: str
+
+
+@dataclass
+class RequestTrace:
+    """Upstream calls made while serving one request."""
+    started: float = field(default_factory=time.perf_counter)
+    calls: List[UpstreamCall] = field(default_factory=list)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """Call count and total seconds per operation, in first-call order."""
+        summary: Dict[str, Dict[str, float]] = {}
+        for call in self.calls:
+            entry = summary.setdefault(call.operation, {"count": 0, "duration": 0.0})
+            entry["count"] += 1
+            entry["duration"] += call.duration
+        return summary
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: total upstream time, then each operation."""
+        upstream = sum(call.duration for call in self.calls)
+        metrics = [
+            f'upstream;dur={upstream * 1000:.1f};desc="{len(self.calls)} calls"'
+        ]
+        for operation, entry in self.breakdown().items():
+            metrics.append(
+                f'{metric_token(operation)};dur={entry["duration"] * 1000:.1f};desc="x{entry["count"]}"'
+            )
+        metrics.append(f"app;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+_current: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def start_trace() -> RequestTrace:
+    trace = RequestTrace()
+    _current.set(trace)
+    return trace
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current.get()
+
+
+def record_upstream_call(operation: str, duration: float, outcome: str) -> None:
+    """
+    Attach a call to the current request, if any. Work shared through
+    SingleFlight is attributed to the request that started it.
+    """
+    trace = _current.get()
+    if trace is not None:
+        trace.calls.append(UpstreamCall(operation, duration, outcome))
@@ -0,0 +1,353 @@
+"""
+In-process stand-in for the Supabase GoTrue and PostgREST endpoints the
+app uses, with configurable injected latency.
+
+Only the requests the services actually issue are implemented, against
+in-memory tables. Tokens are HS256 JWTs signed with the secret the app
+is configured with, so the app verifies them locally as in production.
+"""
+import asyncio
+import random
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import jwt
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+ACCESS_TOKEN_TTL = 3600
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class FakeSupabase:
+    """In-memory state plus the ASGI app serving it."""
+
+    def __init__(self, jwt_secret: str, latency_ms: float = 0, jitter_ms: float = 0):
+        self.jwt_secret = jwt_secret
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.calls = 0
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.refresh_tokens: Dict[str, str] = {}
+        self.rooms: Dict[str, Dict[str, Any]] = {}
+        self.participants: Dict[str, set] = {}
+        self.responses: List[Dict[str, Any]] = []
+        self.question = self._seed_question()
+        self.app = self._build_app()
+
+    # ------------------------------------------------------------------ data
+
+    @staticmethod
+    def _seed_question() -> Dict[str, Any]:
+        question_id = str(uuid.uuid4())
+        return {
+            "id": str(uuid.uuid4()),
+            "questions": {
+                "id": question_id,
+                "text": "Si pudieran viajar manana, a donde irian?",
+                "intensity_level": 1,
+                "options": [
+                    {"id": str(uuid.uuid4()), "text": text, "position": i}
+                    for i, text in enumerate(["Playa", "Montana", "Ciudad", "Casa"], 1)
+                ]
+            }
+        }
+
+    @property
+    def option_ids(self) -> List[str]:
+        return [o["id"] for o in self.question["questions"]["options"]]
+
+    def _session(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        issued = int(time.time())
+        access_token = jwt.encode(
+            {
+                "sub": user["id"],
+                "aud": "authenticated",
+                "role": "authenticated",
+                "iat": issued,
+                "exp": issued + ACCESS_TOKEN_TTL,
+                "is_anonymous": True,
+                "app_metadata": {"provider": "anon"}
+            },
+            self.jwt_secret,
+            algorithm="HS256"
+        )
+        refresh_token = uuid.uuid4().hex
+        self.refresh_tokens[refresh_token] = user["id"]
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_TTL,
+            "expires_at": issued + ACCESS_TOKEN_TTL,
+            "user": user
+        }
+
+    def _caller(self, request: Request) -> Optional[str]:
+        token = request.headers.get("authorization", "").removeprefix("Bearer ")
+        try:
+            return jwt.decode(token, self.jwt_secret, algorithms=["HS256"], audience="authenticated")["sub"]
+        except jwt.PyJWTError:
+            return None
+
+    @staticmethod
+    def _filters(request: Request) -> List[Tuple[str, str, str]]:
+        filters = []
+        for column, expression in request.query_params.multi_items():
+            if column in ("select", "limit", "offset", "order", "or", "columns"):
+                continue
+            op, _, value = expression.partition(".")
+            filters.append((column, op, value))
+        return filters
+
+    @staticmethod
+    def _matches(row: Dict[str, Any], filters: List[Tuple[str, str, str]]) -> bool:
+        for column, op, value in filters:
+            if op == "eq" and str(row.get(column)) != value:
+                return False
+            if op == "is" and value == "null" and row.get(column) is not None:
+                return False
+        return True
+
+    def _is_member(self, room_id: str, caller: Optional[str]) -> bool:
+        return caller in self.participants.get(room_id, set())
+
+    def _visible_responses(self, caller: Optional[str]) -> List[Dict[str, Any]]:
+        # The responses select policy: only rooms the caller is a member of
+        return [r for r in self.responses if self._is_member(r["room_id"], caller)]
+
+    def _room_state(self, room_id: str, daily_question_id: str, caller: str) -> Dict[str, Any]:
+        day = [
+            r for r in self._visible_responses(caller)
+            if r["room_id"] == room_id and r["daily_question_id"] == daily_question_id
+        ]
+        room = self.rooms.get(room_id, {})
+        return {
+            "room_id": room_id,
+            "daily_question_id": daily_question_id,
+            "answer_count": len(day),
+            "both_answered": len(day) >= 2,
+            "user_answered": any(r["user_id"] == caller for r in day),
+            "responses": day,
+            "mutual_count": 0,
+            "shared_choice": False,
+            "streak": room.get("streak_count", 0)
+        }
+
+    def _submit(self, params: Dict[str, Any], caller: Optional[str]) -> JSONResponse:
+        if caller is None:
+            return JSONResponse({"message": "Not authenticated"}, status_code=401)
+
+        room = self.rooms.get(params["p_room_id"])
+        if room is None:
+            return JSONResponse({"message": "Room not found"}, status_code=400)
+
+        answered = {
+            r["user_id"] for r in self.responses
+            if r["room_id"] == room["id"]
+            and r["daily_question_id"] == params["p_daily_question_id"]
+        }
+        if caller in answered:
+            return JSONResponse(
+                {
+                    "code": "23505",
+                    "message": 'duplicate key value violates unique constraint "uniq_response_per_user_day"'
+                },
+                status_code=409
+            )
+        members = self.participants.setdefault(room["id"], set())
+        if caller not in members:
+            if len(members) >= room["max_participants"]:
+                return JSONResponse({"message": "Room is full"}, status_code=400)
+            members.add(caller)
+
+        response = {
+            "id": str(uuid.uuid4()),
+            "room_id": room["id"],
+            "user_id": caller,
+            "daily_question_id": params["p_daily_question_id"],
+            "self_option_id": params["p_self_option_id"],
+            "partner_prediction_option_id": params["p_partner_prediction_option_id"],
+            "created_at": _now()
+        }
+        self.responses.append(response)
+
+        answer_count = len(answered) + 1
+        if answer_count == 2:
+            room["streak_count"] = room.get("streak_count", 0) + 1
+            room["last_streak_date"] = date.today().isoformat()
+
+        return JSONResponse({
+            "response_id": response["id"],
+            "room_id": room["id"],
+            "daily_question_id": params["p_daily_question_id"],
+            "answer_count": answer_count,
+            "both_answered": answer_count >= 2,
+            "user_answered": True
+        })
+
+    # ------------------------------------------------------------------- app
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def inject_latency(request: Request, call_next):
+            self.calls += 1
+            delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+            return await call_next(request)
+
+        @app.post("/auth/v1/signup")
+        async def signup():
+            user = {
+                "id": str(uuid.uuid4()),
+                "aud": "authenticated",
+                "role": "authenticated",
+                "app_metadata": {"provider": "anon"},
+                "user_metadata": {},
+                "is_anonymous": True,
+                "created_at": _now()
+            }
+            self.users[user["id"]] = user
+            return self._session(user)
+
+        @app.post("/auth/v1/token")
+        async def token(request: Request):
+            body = await request.json()
+            # Refresh tokens rotate: each one can be used once
+            user_id = self.refresh_tokens.pop(body.get("refresh_token"), None)
+            if user_id is None:
+                return JSONResponse(
+                    {"error": "invalid_grant", "error_description": "Invalid Refresh Token"},
+                    status_code=400
+                )
+            return self._session(self.users[user_id])
+
+        @app.get("/auth/v1/user")
+        async def get_user(request: Request):
+            user = self.users.get(self._caller(request) or "")
+            if user is None:
+                return JSONResponse({"msg": "invalid JWT"}, status_code=401)
+            return user
+
+        @app.get("/auth/v1/.well-known/jwks.json")
+        async def jwks():
+            return {"keys": []}
+
+        @app.get("/rest/v1/daily_questions")
+        async def daily_questions(request: Request):
+            # .single() asks for an object, everything else gets rows
+            if "vnd.pgrst.object" in request.headers.get("accept", ""):
+                return self.question
+            return [self.question]
+
+        @app.get("/rest/v1/rooms")
+        async def select_rooms(request: Request):
+            filters = self._filters(request)
+            return [room for room in self.rooms.values() if self._matches(room, filters)]
+
+        @app.post("/rest/v1/rooms")
+        async def insert_rooms(request: Request):
+            body = await request.json()
+            rows = []
+            for data in body if isinstance(body, list) else [body]:
+                room = {
+                    "id": str(uuid.uuid4()),
+                    "created_at": _now(),
+                    "claimed_at": _now(),
+                    "last_streak_date": None,
+                    **data
+                }
+                self.rooms[room["id"]] = room
+                rows.append(room)
+            return JSONResponse(rows, status_code=201)
+
+        @app.patch("/rest/v1/rooms")
+        async def update_rooms(request: Request):
+            body = await request.json()
+            filters = self._filters(request)
+            rows = [room for room in self.rooms.values() if self._matches(room, filters)]
+            for room in rows:
+                room.update(body)
+            return rows
+
+        @app.get("/rest/v1/responses")
+        async def select_responses(request: Request):
+            filters = self._filters(request)
+            rows = self._visible_responses(self._caller(request))
+            return [r for r in rows if self._matches(r, filters)]
+
+        @app.get("/rest/v1/room_participants")
+        async def select_room_participants(request: Request):
+            caller = self._caller(request)
+            rows = [
+                {"room_id": room_id, "user_id": caller}
+                for room_id, members in self.participants.items()
+                if caller in members
+            ]
+            filters = self._filters(request)
+            return [row for row in rows if self._matches(row, filters)]
+
+        @app.post("/rest/v1/rpc/submit_response")
+        async def submit_response(request: Request):
+            return self._submit(await request.json(), self._caller(request))
+
+        @app.post("/rest/v1/rpc/cleanup_unclaimed_rooms")
+        async def cleanup_unclaimed_rooms(request: Request):
+            seconds = float((await request.json())["max_age"].split()[0])
+            cutoff = datetime.now(timezone.utc).timestamp() - seconds
+            stale = [
+                room_id for room_id, room in self.rooms.items()
+                if room.get("claimed_at") is None
+                and datetime.fromisoformat(room["created_at"]).timestamp() < cutoff
+            ]
+            for room_id in stale:
+                del self.rooms[room_id]
+            return len(stale)
+
+        @app.post("/rest/v1/rpc/join_room")
+        async def join_room(request: Request):
+            caller = self._caller(request)
+            room = self.rooms.get((await request.json())["p_room_id"])
+            if caller is None or room is None:
+                return JSONResponse({"message": "Room not found"}, status_code=400)
+            members = self.participants.setdefault(room["id"], set())
+            if caller not in members and len(members) >= room["max_participants"]:
+                return JSONResponse({"message": "Room is full"}, status_code=400)
+            members.add(caller)
+            return {
+                "room_id": room["id"],
+                "participant_count": len(members),
+                "max_participants": room["max_participants"]
+            }
+
+        @app.post("/rest/v1/rpc/get_daily_question_responses")
+        async def get_daily_question_responses(request: Request):
+            params = await request.json()
+            caller = self._caller(request)
+            return {
+                "is_participant": self._is_member(params["p_room_id"], caller),
+                "responses": [
+                    r for r in self._visible_responses(caller)
+                    if r["room_id"] == params["p_room_id"]
+                    and r["daily_question_id"] == params["p_daily_question_id"]
+                ]
+            }
+
+        @app.post("/rest/v1/rpc/get_room_state")
+        async def get_room_state(request: Request):
+            params = await request.json()
+            return self._room_state(
+                params["p_room_id"],
+                params["p_daily_question_id"],
+                self._caller(request)
+            )
+
+        return app
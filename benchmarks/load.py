@@ -0,0 +1,212 @@
+"""
+Offline load test: drive the app's real flows against a local Supabase
+stand-in and report latency percentiles, throughput and upstream calls.
+
+Each flow runs as its own phase so upstream calls can be attributed to
+it: start-session, question page, submit, status polling and streak.
+
+Usage: python -m benchmarks.load [--requests N] [--concurrency C]
+                                 [--latency-ms MS] [--jitter-ms MS]
+"""
+import argparse
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+JWT_SECRET = "benchmark-secret-benchmark-secret-benchmark"
+
+# The app reads its configuration at import time
+os.environ.update({
+    "SUPABASE_URL": "http://supabase.local",
+    "SUPABASE_ANON_KEY": "anon-key",
+    "SUPABASE_SERVICE_ROLE_KEY": "service-role-key",
+    "SUPABASE_JWT_SECRET": JWT_SECRET,
+    "JWT_VERIFY_MODE": "local",
+    "QUESTION_PREWARM_ENABLED": "false",
+    "SLOW_REQUEST_THRESHOLD_MS": "0"
+})
+
+from app.main import app  # noqa: E402
+from app.config import SESSION_ACCESS_COOKIE, SESSION_REFRESH_COOKIE  # noqa: E402
+from app.services import room_service  # noqa: E402
+from app.utils.supabase import InstrumentedTransport, registry  # noqa: E402
+
+from .fake_supabase import FakeSupabase  # noqa: E402
+
+
+@dataclass
+class PhaseResult:
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+    upstream_calls: int = 0
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def row(self) -> str:
+        count = len(self.latencies)
+        return (
+            f"{self.name:<16} {count:>6} {self.errors:>6} "
+            f"{self.percentile(50) * 1000:>8.1f} {self.percentile(95) * 1000:>8.1f} "
+            f"{self.percentile(99) * 1000:>8.1f} {count / self.elapsed if self.elapsed else 0:>9.1f} "
+            f"{self.upstream_calls / count if count else 0:>9.2f}"
+        )
+
+
+HEADER = (
+    f"{'flow':<16} {'reqs':>6} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} "
+    f"{'p99 ms':>8} {'req/s':>9} {'upstream':>9}"
+)
+
+
+async def run_phase(
+    name: str,
+    fake: FakeSupabase,
+    jobs: List[Callable[[], Awaitable[httpx.Response]]],
+    concurrency: int
+) -> PhaseResult:
+    """Run the jobs with at most ``concurrency`` in flight."""
+    result = PhaseResult(name)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await job()
+                if response.status_code >= 400:
+                    result.errors += 1
+            except Exception:
+                result.errors += 1
+            result.latencies.append(time.perf_counter() - started)
+
+    calls_before = fake.calls
+    started = time.perf_counter()
+    await asyncio.gather(*(run(job) for job in jobs))
+    result.elapsed = time.perf_counter() - started
+    result.upstream_calls = fake.calls - calls_before
+    return result
+
+
+async def main_async(args: argparse.Namespace) -> List[PhaseResult]:
+    fake = FakeSupabase(JWT_SECRET, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+
+    # Point the shared Supabase pool at the stand-in, keeping the
+    # instrumentation the app normally wraps around it
+    await registry.close()
+    registry._http_client = httpx.AsyncClient(
+        transport=InstrumentedTransport(httpx.ASGITransport(fake.app))
+    )
+
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app),
+        base_url="http://app.local",
+        timeout=60
+    )
+    results = []
+
+    if room_service.ROOM_POOL_SIZE > 0:
+        await room_service.refill_room_pool()
+
+    sessions: List[Dict[str, Any]] = []
+
+    async def start_session():
+        response = await client.post("/api/start-session")
+        if response.status_code == 200:
+            sessions.append(response.json())
+        return response
+
+    results.append(await run_phase(
+        "start-session", fake, [start_session] * args.requests, args.concurrency
+    ))
+    if not sessions:
+        raise SystemExit("start-session failed; nothing to drive")
+
+    def pick(i: int) -> Dict[str, Any]:
+        return sessions[i % len(sessions)]
+
+    def auth(session: Dict[str, Any]) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {session['access_token']}"}
+
+    daily_question_id = fake.question["id"]
+    self_option, prediction = fake.option_ids[:2]
+
+    def question_page(session):
+        return lambda: client.get(
+            f"/question/{session['room_id']}",
+            cookies={
+                SESSION_ACCESS_COOKIE: session["access_token"],
+                SESSION_REFRESH_COOKIE: session["refresh_token"]
+            }
+        )
+
+    def submit(session):
+        return lambda: client.post(
+            "/api/responses",
+            json={
+                "room_id": session["room_id"],
+                "daily_question_id": daily_question_id,
+                "self_option_id": self_option,
+                "partner_prediction_option_id": prediction
+            },
+            headers=auth(session)
+        )
+
+    def status(session):
+        return lambda: client.get(
+            f"/api/responses/room/{session['room_id']}/status/{daily_question_id}",
+            headers=auth(session)
+        )
+
+    def streak(session):
+        return lambda: client.get(
+            f"/api/responses/room/{session['room_id']}/streak",
+            headers=auth(session)
+        )
+
+    # Each session answers once; the other flows cycle through sessions
+    for name, flow, count in (
+        ("question-page", question_page, args.requests),
+        ("submit", submit, len(sessions)),
+        ("status", status, args.requests),
+        ("streak", streak, args.requests)
+    ):
+        jobs = [flow(pick(i)) for i in range(count)]
+        results.append(await run_phase(name, fake, jobs, args.concurrency))
+
+    await client.aclose()
+    await registry.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500, help="requests per flow")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20, help="injected upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+
+    print(
+        f"{args.requests} requests per flow, concurrency {args.concurrency}, "
+        f"upstream latency {args.latency_ms}±{args.jitter_ms} ms"
+    )
+    print(HEADER)
+    for result in results:
+        print(result.row())
+
+
+if __name__ == "__main__":
+    main()
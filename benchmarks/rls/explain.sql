@@ -0,0 +1,27 @@
+-- Reads of responses as room 1's first member, through the RLS policy.
+-- Run once before and once after 012_room_participants.sql.
+
+begin;
+set local role authenticated;
+select set_config('request.jwt.claims', json_build_object('sub', md5('user1')::uuid)::text, true);
+
+-- History page (GET /api/responses/room/{room_id})
+explain (analyze, buffers, costs off)
+select * from public.responses
+where room_id = md5('room1')::uuid
+order by created_at desc, id desc
+limit 21;
+
+-- Answer status (GET /api/responses/room/{room_id}/status/{daily_question_id})
+explain (analyze, buffers, costs off)
+select user_id from public.responses
+where room_id = md5('room1')::uuid
+  and daily_question_id = md5('daily1')::uuid;
+
+-- A read without a room filter: the policy is evaluated for every row of
+-- the day (20,000 candidates), and only the caller's room is visible
+explain (analyze, buffers, costs off)
+select count(*) from public.responses
+where daily_question_id = md5('daily1')::uuid;
+
+rollback;
@@ -0,0 +1,35 @@
+#!/bin/sh
+# EXPLAIN ANALYZE of the responses RLS policy before and after
+# 012_room_participants.sql, on an empty scratch database.
+#
+# Usage: benchmarks/rls/run.sh postgresql://postgres@localhost/rls_bench
+set -eu
+
+DSN="${1:?usage: $0 DATABASE_URL}"
+HERE="$(cd "$(dirname "$0")" && pwd)"
+MIGRATIONS="$HERE/../../supabase/migrations"
+
+run() {
+    psql "$DSN" -X -q -v ON_ERROR_STOP=1 "$@"
+}
+
+run -f "$HERE/supabase_stub.sql"
+for migration in "$MIGRATIONS"/0*.sql; do
+    case "$migration" in
+        *012_room_participants.sql) ;;
+        *) run -f "$migration" ;;
+    esac
+done
+run -f "$HERE/seed.sql"
+
+# Each phase runs the queries twice and reports the second, warm, run
+run -f "$HERE/explain.sql" > /dev/null
+echo "== before 012_room_participants.sql"
+run -f "$HERE/explain.sql"
+
+run -f "$MIGRATIONS/012_room_participants.sql"
+run -c "vacuum analyze"
+
+run -f "$HERE/explain.sql" > /dev/null
+echo "== after 012_room_participants.sql"
+run -f "$HERE/explain.sql"
@@ -0,0 +1,45 @@
+-- Seed for measuring the responses RLS policy on a large table:
+-- 10,000 couple rooms whose two members answered each of 100 days,
+-- i.e. 2,000,000 responses. Applied after migrations 001-011, with
+-- triggers off (session_replication_role), as a restore would be.
+
+set session_replication_role = replica;
+
+insert into public.questions (id, text, intensity_level)
+select md5('question' || d)::uuid, 'Seed question ' || d, 1 + d % 5
+from generate_series(1, 100) d;
+
+insert into public.options (id, question_id, text, position)
+select md5('option' || d || '-' || p)::uuid, md5('question' || d)::uuid,
+       'Option ' || p, p
+from generate_series(1, 100) d, generate_series(1, 3) p;
+
+-- Before the dates 002_seed_data.sql uses
+insert into public.daily_questions (id, question_id, date)
+select md5('daily' || d)::uuid, md5('question' || d)::uuid, current_date - 1 - d
+from generate_series(1, 100) d;
+
+insert into auth.users (id)
+select md5('user' || u)::uuid
+from generate_series(1, 20000) u;
+
+insert into public.rooms (id, token, created_at)
+select md5('room' || r)::uuid, 'seed' || r, now() - interval '101 days'
+from generate_series(1, 10000) r;
+
+insert into public.responses (
+    room_id, user_id, daily_question_id,
+    self_option_id, partner_prediction_option_id, created_at
+)
+select md5('room' || r)::uuid,
+       md5('user' || (2 * r - m))::uuid,
+       md5('daily' || d)::uuid,
+       md5('option' || d || '-' || (1 + (r + m) % 3))::uuid,
+       md5('option' || d || '-' || (1 + (r + d) % 3))::uuid,
+       (current_date - 1 - d) + make_interval(secs => r % 86400)
+from generate_series(1, 10000) r, generate_series(1, 100) d, generate_series(0, 1) m;
+
+set session_replication_role = origin;
+
+-- Hint bits and visibility map as on a long-running database
+vacuum analyze;
@@ -0,0 +1,41 @@
+-- Minimal stand-in for the parts of a Supabase database the migrations
+-- use (auth.users, auth.uid() and the API roles), so they can be applied
+-- to a plain PostgreSQL server.
+
+do $$
+begin
+    if not exists (select 1 from pg_roles where rolname = 'anon') then
+        create role anon nologin;
+    end if;
+    if not exists (select 1 from pg_roles where rolname = 'authenticated') then
+        create role authenticated nologin;
+    end if;
+    if not exists (select 1 from pg_roles where rolname = 'service_role') then
+        create role service_role nologin bypassrls;
+    end if;
+end
+$$;
+
+create schema if not exists auth;
+
+create table if not exists auth.users (
+    id uuid primary key,
+    raw_user_meta_data jsonb not null default '{}'::jsonb,
+    created_at timestamptz not null default now()
+);
+
+-- Same lookup as GoTrue's auth.uid(): the sub claim of the request JWT
+create or replace function auth.uid()
+returns uuid
+language sql
+stable
+as $$
+    select coalesce(
+        nullif(current_setting('request.jwt.claim.sub', true), ''),
+        nullif(current_setting('request.jwt.claims', true), '')::jsonb ->> 'sub'
+    )::uuid
+$$;
+
+grant usage on schema auth, public to anon, authenticated, service_role;
+alter default privileges in schema public
+    grant select, insert, update, delete on tables to anon, authenticated, service_role;
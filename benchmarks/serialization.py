@@ -0,0 +1,121 @@
+"""
+Micro-benchmark: per-request JSON serialization cost of the API responses.
+
+Compares FastAPI's default path (response_model re-validation or
+jsonable_encoder, then stdlib json) with the path the routes use now
+(ORJSONResponse returned directly, models dumped once).
+
+Usage: python -m benchmarks.serialization [--number N]
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.models import DailyQuestionResponse, QuestionOption, StreakResponse
+from app.utils.http import model_response
+
+
+def _response_row(index: int, room_id: str, created_at: datetime) -> Dict[str, Any]:
+    """A row as returned by PostgREST for the room history query."""
+    return {
+        "id": str(uuid.uuid4()),
+        "room_id": room_id,
+        "user_id": str(uuid.uuid4()),
+        "daily_question_id": str(uuid.uuid4()),
+        "self_option_id": str(uuid.uuid4()),
+        "partner_prediction_option_id": str(uuid.uuid4()),
+        "created_at": (created_at - timedelta(hours=index)).isoformat(),
+        "self_option": {"text": f"Opcion {index % 4}"},
+        "prediction_option": {"text": f"Opcion {(index + 1) % 4}"}
+    }
+
+
+def _history_page(size: int) -> Dict[str, Any]:
+    room_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    return {
+        "responses": [_response_row(i, room_id, now) for i in range(size)],
+        "next_cursor": "WyIyMDI2LTAxLTAxVDAwOjAwOjAwKzAwOjAwIiwgImlkIl0="
+    }
+
+
+def _route_field(model):
+    async def endpoint():
+        return None
+    return APIRoute("/", endpoint, response_model=model).response_field
+
+
+def _before(content: Any, field=None) -> bytes:
+    """What FastAPI does for a route returning plain data or a model."""
+    # serialize_response never suspends for async endpoints, so drive the
+    # coroutine directly instead of paying for an event loop per call
+    coro = serialize_response(field=field, response_content=content)
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return JSONResponse(done.value).body
+    raise RuntimeError("serialize_response suspended")
+
+
+def _time(fn: Callable[[], Any], number: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def _cases() -> List[tuple]:
+    question = DailyQuestionResponse(
+        id=str(uuid.uuid4()),
+        text="Si pudieran viajar manana, a donde irian?",
+        intensity_level=1,
+        options=[
+            QuestionOption(id=str(uuid.uuid4()), text=f"Opcion {i}", position=i)
+            for i in range(4)
+        ]
+    )
+    streak = StreakResponse(streak=12, room_id=str(uuid.uuid4()))
+    question_field = _route_field(DailyQuestionResponse)
+    streak_field = _route_field(StreakResponse)
+
+    cases = []
+    for size in (2, 50, 200):
+        page = _history_page(size)
+        cases.append((
+            f"room history, {size} rows",
+            lambda page=page: _before(page),
+            lambda page=page: ORJSONResponse(page).body
+        ))
+    cases.append((
+        "today's question (model)",
+        lambda: _before(question, question_field),
+        lambda: model_response(question).body
+    ))
+    cases.append((
+        "streak (model)",
+        lambda: _before(streak, streak_field),
+        lambda: model_response(streak).body
+    ))
+    return cases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'case':<28} {'before (us)':>12} {'after (us)':>12} {'speedup':>8}")
+    for name, before, after in _cases():
+        before_us = _time(before, args.number)
+        after_us = _time(after, args.number)
+        print(f"{name:<28} {before_us:>12.1f} {after_us:>12.1f} {before_us / after_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Build fingerprinted, precompressed static assets into app/static/dist.
+Usage: python build_static.py
+"""
+from app.utils.assets import build_assets
+
+if __name__ == "__main__":
+    manifest = build_assets()
+    for source, target in manifest.items():
+        print(f"{source} -> {target}")
@@ -0,0 +1,89 @@
+-- Maintain rooms.streak_count / last_streak_date incrementally
+-- The streak is updated when the second participant answers a day's question,
+-- so reading it is a single primary-key lookup on rooms.
+
+create or replace function public.update_room_streak()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    answer_count integer;
+    question_date date;
+    previous_date date;
+begin
+    select count(distinct user_id)
+    into answer_count
+    from public.responses
+    where room_id = new.room_id
+      and daily_question_id = new.daily_question_id;
+
+    -- Only the answer that completes the pair moves the streak
+    if answer_count <> 2 then
+        return new;
+    end if;
+
+    select date
+    into question_date
+    from public.daily_questions
+    where id = new.daily_question_id;
+
+    -- The room row is already locked by check_room_capacity
+    select last_streak_date
+    into previous_date
+    from public.rooms
+    where id = new.room_id;
+
+    if previous_date = question_date then
+        return new;
+    end if;
+
+    update public.rooms
+    set streak_count = case
+            when previous_date = question_date - 1 then streak_count + 1
+            else 1
+        end,
+        last_streak_date = question_date
+    where id = new.room_id
+      and (last_streak_date is null or last_streak_date < question_date);
+
+    return new;
+end;
+$$;
+
+drop trigger if exists update_room_streak_trigger on public.responses;
+create trigger update_room_streak_trigger
+    after insert on public.responses
+    for each row
+    execute procedure public.update_room_streak();
+
+-- =========================================================
+-- BACKFILL: current streak from existing responses
+-- =========================================================
+with completed_days as (
+    select r.room_id, dq.date
+    from public.responses r
+    join public.daily_questions dq on dq.id = r.daily_question_id
+    group by r.room_id, dq.date
+    having count(distinct r.user_id) >= 2
+),
+islands as (
+    select room_id,
+           date,
+           date - (row_number() over (partition by room_id order by date))::int as island
+    from completed_days
+),
+latest_island as (
+    select distinct on (room_id)
+           room_id,
+           count(*) over (partition by room_id, island) as streak,
+           max(date) over (partition by room_id, island) as last_date
+    from islands
+    order by room_id, date desc
+)
+update public.rooms ro
+set streak_count = li.streak,
+    last_streak_date = li.last_date
+from latest_island li
+where ro.id = li.room_id;
@@ -0,0 +1,90 @@
+-- Aggregated room state for the question page in a single round trip
+-- Returns answer status, both responses with option texts, prediction
+-- matches and the current streak as one JSON document.
+--
+-- Runs with the caller's rights, so the responses RLS policy still decides
+-- what the caller can see (non-participants get no responses).
+
+create or replace function public.get_room_state(
+    p_room_id uuid,
+    p_daily_question_id uuid,
+    p_today date default current_date
+)
+returns jsonb
+language sql
+stable
+set search_path = public
+as $$
+    with day_responses as (
+        select r.id,
+               r.user_id,
+               r.self_option_id,
+               r.partner_prediction_option_id,
+               r.created_at,
+               so.text as self_option_text,
+               po.text as prediction_option_text
+        from public.responses r
+        join public.options so on so.id = r.self_option_id
+        join public.options po on po.id = r.partner_prediction_option_id
+        where r.room_id = p_room_id
+          and r.daily_question_id = p_daily_question_id
+    ),
+    scored as (
+        select d.*,
+               (
+                   select d.partner_prediction_option_id = partner.self_option_id
+                   from day_responses partner
+                   where partner.user_id <> d.user_id
+                   limit 1
+               ) as prediction_correct
+        from day_responses d
+    ),
+    room as (
+        select streak_count, last_streak_date
+        from public.rooms
+        where id = p_room_id
+    )
+    select jsonb_build_object(
+        'room_id', p_room_id,
+        'daily_question_id', p_daily_question_id,
+        'answer_count', (select count(*) from scored),
+        'both_answered', (select count(*) >= 2 from scored),
+        'user_answered', exists (select 1 from scored where user_id = auth.uid()),
+        'responses', coalesce(
+            (
+                select jsonb_agg(
+                    jsonb_build_object(
+                        'id', s.id,
+                        'user_id', s.user_id,
+                        'self_option_id', s.self_option_id,
+                        'partner_prediction_option_id', s.partner_prediction_option_id,
+                        'created_at', s.created_at,
+                        'self_option', jsonb_build_object('text', s.self_option_text),
+                        'prediction_option', jsonb_build_object('text', s.prediction_option_text),
+                        'prediction_correct', s.prediction_correct
+                    )
+                    order by s.created_at
+                )
+                from scored s
+            ),
+            '[]'::jsonb
+        ),
+        'mutual_count', (select count(*) from scored where prediction_correct),
+        'shared_choice', (
+            select count(*) >= 2 and count(distinct self_option_id) = 1
+            from scored
+        ),
+        'streak', coalesce(
+            (
+                select case
+                    when last_streak_date >= p_today - 1 then streak_count
+                    else 0
+                end
+                from room
+            ),
+            0
+        )
+    );
+$$;
+
+grant execute on function public.get_room_state(uuid, uuid, date) to authenticated;
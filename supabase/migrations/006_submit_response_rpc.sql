@@ -0,0 +1,178 @@
+-- Atomic submit-and-status RPC
+-- Validates options, enforces room capacity, inserts the response and
+-- returns the new id plus the day's answer count in one statement.
+-- The insert triggers skip the checks this function already performed.
+
+create or replace function public.submit_response(
+    p_room_id uuid,
+    p_daily_question_id uuid,
+    p_self_option_id uuid,
+    p_partner_prediction_option_id uuid
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    caller uuid := auth.uid();
+    room_limit integer;
+    correct_question uuid;
+    answered uuid[];
+    new_response_id uuid;
+    answer_count integer;
+begin
+    if caller is null then
+        raise exception 'Not authenticated' using errcode = '28000';
+    end if;
+
+    -- Lock del room (serializes concurrent answers for the same room)
+    select max_participants
+    into room_limit
+    from public.rooms
+    where id = p_room_id
+    for update;
+
+    if room_limit is null then
+        raise exception 'Room not found';
+    end if;
+
+    select question_id
+    into correct_question
+    from public.daily_questions
+    where id = p_daily_question_id;
+
+    if not exists (
+        select 1 from public.options
+        where id = p_self_option_id
+          and question_id = correct_question
+    ) then
+        raise exception 'Invalid self option for this question';
+    end if;
+
+    if not exists (
+        select 1 from public.options
+        where id = p_partner_prediction_option_id
+          and question_id = correct_question
+    ) then
+        raise exception 'Invalid partner prediction option';
+    end if;
+
+    select coalesce(array_agg(distinct user_id), '{}')
+    into answered
+    from public.responses
+    where room_id = p_room_id
+      and daily_question_id = p_daily_question_id;
+
+    if caller = any(answered) then
+        raise exception 'duplicate key value violates unique constraint "uniq_response_per_user_day"'
+            using errcode = '23505';
+    end if;
+
+    if cardinality(answered) >= room_limit then
+        raise exception 'Room capacity exceeded for this day';
+    end if;
+
+    perform set_config('app.response_prevalidated', 'on', true);
+
+    insert into public.responses (
+        room_id,
+        user_id,
+        daily_question_id,
+        self_option_id,
+        partner_prediction_option_id
+    )
+    values (
+        p_room_id,
+        caller,
+        p_daily_question_id,
+        p_self_option_id,
+        p_partner_prediction_option_id
+    )
+    returning id into new_response_id;
+
+    perform set_config('app.response_prevalidated', 'off', true);
+
+    answer_count := cardinality(answered) + 1;
+
+    return jsonb_build_object(
+        'response_id', new_response_id,
+        'room_id', p_room_id,
+        'daily_question_id', p_daily_question_id,
+        'answer_count', answer_count,
+        'both_answered', answer_count >= 2,
+        'user_answered', true
+    );
+end;
+$$;
+
+grant execute on function public.submit_response(uuid, uuid, uuid, uuid) to authenticated;
+
+-- =========================================================
+-- Insert triggers: skip work already done by submit_response
+-- =========================================================
+create or replace function public.check_room_capacity()
+returns trigger as $$
+declare
+    participant_count integer;
+    room_limit integer;
+begin
+    if current_setting('app.response_prevalidated', true) = 'on' then
+        return new;
+    end if;
+
+    -- Lock del room
+    select max_participants
+    into room_limit
+    from public.rooms
+    where id = new.room_id
+    for update;
+
+    select count(distinct user_id)
+    into participant_count
+    from public.responses
+    where room_id = new.room_id
+      and daily_question_id = new.daily_question_id;
+
+    if participant_count >= room_limit then
+        raise exception 'Room capacity exceeded for this day';
+    end if;
+
+    return new;
+end;
+$$ language plpgsql;
+
+create or replace function public.validate_response_options()
+returns trigger as $$
+declare
+    correct_question uuid;
+begin
+    if current_setting('app.response_prevalidated', true) = 'on' then
+        return new;
+    end if;
+
+    select q.id
+    into correct_question
+    from public.daily_questions dq
+    join public.questions q on q.id = dq.question_id
+    where dq.id = new.daily_question_id;
+
+    if not exists (
+        select 1 from public.options
+        where id = new.self_option_id
+          and question_id = correct_question
+    ) then
+        raise exception 'Invalid self option for this question';
+    end if;
+
+    if not exists (
+        select 1 from public.options
+        where id = new.partner_prediction_option_id
+          and question_id = correct_question
+    ) then
+        raise exception 'Invalid partner prediction option';
+    end if;
+
+    return new;
+end;
+$$ language plpgsql;
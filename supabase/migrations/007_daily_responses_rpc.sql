@@ -0,0 +1,38 @@
+-- Single-query read of a room's responses for one day
+-- Returns the participation flag together with the responses, so the API
+-- can answer "not a participant" without a separate lookup. Runs with the
+-- caller's rights: the responses RLS policy still filters the rows.
+
+create or replace function public.get_daily_question_responses(
+    p_room_id uuid,
+    p_daily_question_id uuid
+)
+returns jsonb
+language sql
+stable
+set search_path = public
+as $$
+    select jsonb_build_object(
+        'is_participant', public.is_room_participant(p_room_id),
+        'responses', coalesce(
+            (
+                select jsonb_agg(
+                    to_jsonb(r)
+                    || jsonb_build_object(
+                        'self_option', jsonb_build_object('text', so.text),
+                        'prediction_option', jsonb_build_object('text', po.text)
+                    )
+                    order by r.created_at
+                )
+                from public.responses r
+                join public.options so on so.id = r.self_option_id
+                join public.options po on po.id = r.partner_prediction_option_id
+                where r.room_id = p_room_id
+                  and r.daily_question_id = p_daily_question_id
+            ),
+            '[]'::jsonb
+        )
+    );
+$$;
+
+grant execute on function public.get_daily_question_responses(uuid, uuid) to authenticated;
@@ -0,0 +1,5 @@
+-- Index backing keyset pagination of a room's history
+-- GET /api/responses/room/{room_id} pages on (created_at, id) newest first.
+
+create index if not exists idx_responses_room_created
+    on public.responses(room_id, created_at desc, id desc);
@@ -0,0 +1,32 @@
+-- Pre-created room pool
+-- The backend inserts batches of unclaimed rooms (claimed_at is null) and a
+-- new session claims one with a single update instead of an insert.
+-- Existing and directly created rooms count as claimed.
+
+alter table public.rooms
+    add column if not exists claimed_at timestamptz default now();
+
+create index if not exists idx_rooms_unclaimed
+    on public.rooms(created_at)
+    where claimed_at is null;
+
+-- Rooms left unclaimed by a stopped worker are never handed out again;
+-- this removes the stale ones. The backend's room pool task calls it
+-- every ROOM_POOL_CLEANUP_INTERVAL with ROOM_POOL_MAX_AGE.
+create or replace function public.cleanup_unclaimed_rooms(max_age interval default '1 day')
+returns integer
+language sql
+security definer
+set search_path = public
+as $$
+    with deleted as (
+        delete from public.rooms
+        where claimed_at is null
+          and created_at < now() - max_age
+        returning 1
+    )
+    select count(*)::integer from deleted;
+$$;
+
+revoke execute on function public.cleanup_unclaimed_rooms(interval) from public, anon, authenticated;
+grant execute on function public.cleanup_unclaimed_rooms(interval) to service_role;
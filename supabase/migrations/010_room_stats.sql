@@ -0,0 +1,162 @@
+-- Per-room prediction accuracy, maintained incrementally
+-- One row per (room, participant). Updated when the second answer of a day
+-- is inserted, so reading a room's stats is a primary-key range scan of at
+-- most two rows, whatever the room's age.
+--
+-- recent_results keeps the outcome of the participant's last 30 completed
+-- days for the rolling accuracy, with recent_dates holding the matching
+-- question dates; both are ordered by date, oldest first, even when a
+-- pair for an earlier day is completed late.
+
+create table if not exists public.room_stats (
+    room_id uuid not null references public.rooms(id) on delete cascade,
+    user_id uuid not null,
+    days_both_answered integer not null default 0,
+    correct_predictions integer not null default 0,
+    recent_results boolean[] not null default '{}',
+    recent_dates date[] not null default '{}',
+    last_date date,
+    updated_at timestamptz not null default now(),
+    primary key (room_id, user_id)
+);
+
+alter table public.room_stats enable row level security;
+
+drop policy if exists "Room participants can read stats" on public.room_stats;
+create policy "Room participants can read stats"
+on public.room_stats
+for select
+to authenticated
+using (
+    public.is_room_participant(room_id)
+);
+
+create or replace function public.update_room_stats()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    answer_count integer;
+    question_date date;
+begin
+    select count(distinct user_id)
+    into answer_count
+    from public.responses
+    where room_id = new.room_id
+      and daily_question_id = new.daily_question_id;
+
+    -- Only the answer that completes the pair is scored, so each
+    -- (room, daily question) is counted exactly once whatever its date
+    if answer_count <> 2 then
+        return new;
+    end if;
+
+    select date
+    into question_date
+    from public.daily_questions
+    where id = new.daily_question_id;
+
+    -- The room row is locked by submit_response / check_room_capacity,
+    -- so the two answers of a room are never scored concurrently
+    insert into public.room_stats as s (
+        room_id,
+        user_id,
+        days_both_answered,
+        correct_predictions,
+        recent_results,
+        recent_dates,
+        last_date
+    )
+    select r.room_id,
+           r.user_id,
+           1,
+           (r.partner_prediction_option_id = p.self_option_id)::integer,
+           array[r.partner_prediction_option_id = p.self_option_id],
+           array[question_date],
+           question_date
+    from public.responses r
+    join public.responses p
+      on p.room_id = r.room_id
+     and p.daily_question_id = r.daily_question_id
+     and p.user_id <> r.user_id
+    where r.room_id = new.room_id
+      and r.daily_question_id = new.daily_question_id
+    on conflict (room_id, user_id) do update
+    set days_both_answered = s.days_both_answered + 1,
+        correct_predictions = s.correct_predictions + excluded.correct_predictions,
+        -- Merge by date and keep the 30 latest days
+        recent_results = (
+            select array_agg(t.correct order by t.day)
+            from (
+                select day, correct
+                from unnest(
+                    s.recent_dates || excluded.recent_dates,
+                    s.recent_results || excluded.recent_results
+                ) as u(day, correct)
+                order by day desc
+                limit 30
+            ) t
+        ),
+        recent_dates = (
+            select array_agg(t.day order by t.day)
+            from (
+                select day
+                from unnest(s.recent_dates || excluded.recent_dates) as u(day)
+                order by day desc
+                limit 30
+            ) t
+        ),
+        last_date = greatest(s.last_date, excluded.last_date),
+        updated_at = now();
+
+    return new;
+end;
+$$;
+
+drop trigger if exists update_room_stats_trigger on public.responses;
+create trigger update_room_stats_trigger
+    after insert on public.responses
+    for each row
+    execute procedure public.update_room_stats();
+
+-- =========================================================
+-- BACKFILL: stats from existing responses
+-- =========================================================
+with scored as (
+    select r.room_id,
+           r.user_id,
+           dq.date,
+           r.partner_prediction_option_id = p.self_option_id as correct
+    from public.responses r
+    join public.responses p
+      on p.room_id = r.room_id
+     and p.daily_question_id = r.daily_question_id
+     and p.user_id <> r.user_id
+    join public.daily_questions dq on dq.id = r.daily_question_id
+),
+ranked as (
+    select *,
+           row_number() over (partition by room_id, user_id order by date desc) as age
+    from scored
+)
+insert into public.room_stats (
+    room_id,
+    user_id,
+    days_both_answered,
+    correct_predictions,
+    recent_results,
+    recent_dates,
+    last_date
+)
+select room_id,
+       user_id,
+       count(*),
+       count(*) filter (where correct),
+       array_agg(correct order by date) filter (where age <= 30),
+       array_agg(date order by date) filter (where age <= 30),
+       max(date)
+from ranked
+group by room_id, user_id
+on conflict (room_id, user_id) do nothing;
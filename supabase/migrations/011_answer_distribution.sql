@@ -0,0 +1,119 @@
+-- Global answer distribution per daily question
+-- Counts how many answers chose each option for themselves and as the
+-- partner prediction, maintained as responses are inserted. Every room
+-- answers the same daily question, so a single counter row per option
+-- would serialize all submissions of the day on one row lock; counters
+-- are therefore split across shards (picked from the room id) and summed
+-- on read, which touches at most options x shards rows.
+
+create table if not exists public.answer_distribution (
+    daily_question_id uuid not null references public.daily_questions(id) on delete cascade,
+    option_id uuid not null references public.options(id) on delete cascade,
+    shard smallint not null,
+    self_count bigint not null default 0,
+    prediction_count bigint not null default 0,
+    primary key (daily_question_id, option_id, shard)
+);
+
+-- No policies: rows are only read through get_answer_distribution
+alter table public.answer_distribution enable row level security;
+
+create or replace function public.update_answer_distribution()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    -- A room's answers share a shard; different rooms rarely collide.
+    -- Masking is never negative (abs() overflows on -2147483648)
+    counter_shard smallint := (hashtext(new.room_id::text) & 15)::smallint;
+begin
+    insert into public.answer_distribution as d (
+        daily_question_id,
+        option_id,
+        shard,
+        self_count,
+        prediction_count
+    )
+    select new.daily_question_id,
+           o.option_id,
+           counter_shard,
+           count(*) filter (where o.kind = 'self'),
+           count(*) filter (where o.kind = 'prediction')
+    from (
+        values (new.self_option_id, 'self'),
+               (new.partner_prediction_option_id, 'prediction')
+    ) as o(option_id, kind)
+    group by o.option_id
+    on conflict (daily_question_id, option_id, shard) do update
+    set self_count = d.self_count + excluded.self_count,
+        prediction_count = d.prediction_count + excluded.prediction_count;
+
+    return new;
+end;
+$$;
+
+drop trigger if exists update_answer_distribution_trigger on public.responses;
+create trigger update_answer_distribution_trigger
+    after insert on public.responses
+    for each row
+    execute procedure public.update_answer_distribution();
+
+create or replace function public.get_answer_distribution(p_daily_question_id uuid)
+returns jsonb
+language sql
+stable
+security definer
+set search_path = public
+as $$
+    select coalesce(
+        jsonb_agg(
+            jsonb_build_object(
+                'option_id', option_id,
+                'self_count', self_count,
+                'prediction_count', prediction_count
+            )
+        ),
+        '[]'::jsonb
+    )
+    from (
+        select option_id,
+               sum(self_count) as self_count,
+               sum(prediction_count) as prediction_count
+        from public.answer_distribution
+        where daily_question_id = p_daily_question_id
+        group by option_id
+    ) totals;
+$$;
+
+grant execute on function public.get_answer_distribution(uuid) to anon, authenticated;
+
+-- =========================================================
+-- BACKFILL: counters from existing responses
+-- =========================================================
+-- Creating the trigger blocks concurrent inserts until this migration
+-- commits, so shard 0 can hold the historical totals without double counting
+insert into public.answer_distribution (
+    daily_question_id,
+    option_id,
+    shard,
+    self_count,
+    prediction_count
+)
+select daily_question_id,
+       option_id,
+       0,
+       count(*) filter (where kind = 'self'),
+       count(*) filter (where kind = 'prediction')
+from (
+    select daily_question_id, self_option_id as option_id, 'self' as kind
+    from public.responses
+    union all
+    select daily_question_id, partner_prediction_option_id, 'prediction'
+    from public.responses
+) answers
+group by daily_question_id, option_id
+on conflict (daily_question_id, option_id, shard) do update
+set self_count = excluded.self_count,
+    prediction_count = excluded.prediction_count;
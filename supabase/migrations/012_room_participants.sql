@@ -0,0 +1,328 @@
+-- Explicit room membership
+-- Participation used to be implied by having answered at least once, so
+-- every RLS check scanned responses for the caller and a partner could not
+-- read anything before their first answer. room_participants records it
+-- directly: a row is added when a user creates or joins a room (join_room)
+-- or answers in it for the first time, and capacity is the number of members.
+--
+-- The responses policy becomes a semi-join on the caller's memberships
+-- (idx_room_participants_user) with auth.uid() evaluated once per
+-- statement, instead of an is_room_participant() call per candidate row.
+--
+-- EXPLAIN (ANALYZE, BUFFERS) as room 1's first member, PostgreSQL 16.2,
+-- shared_buffers 128MB, warm second run; 10,000 rooms x 2 members x
+-- 100 days = 2,000,000 responses (benchmarks/rls/run.sh, seed.sql and
+-- explain.sql reproduce it):
+--
+--   history page, room_id filter, limit 21
+--     before  Index Scan idx_responses_room_created
+--               Filter: is_room_participant(room_id)     1.252 ms, 149 buffers
+--     after   Index Scan idx_responses_room_created
+--               Filter: (hashed SubPlan 3)               0.223 ms,  22 buffers
+--   answer status, room_id + daily_question_id
+--     before  Index Only Scan uniq_response_per_user_day
+--               Filter: is_room_participant(room_id)     0.288 ms,  12 buffers
+--     after   Index Only Scan uniq_response_per_user_day
+--               Filter: (hashed SubPlan 3)               0.147 ms,   7 buffers
+--   count(*) for one day, no room filter (20,000 candidate rows)
+--     before  Index Only Scan idx_responses_room_day
+--               Filter: is_room_participant(room_id)
+--               Rows Removed by Filter: 19998          614.0 ms, 111,197 buffers
+--     after   Seq Scan on responses
+--               Filter: (hashed SubPlan 3) AND (daily_question_id = ...)
+--               Rows Removed by Filter: 1999998        373.8 ms,  32,790 buffers
+--
+-- The membership subplan runs once per statement (one index-only probe of
+-- idx_room_participants_user, 3 buffers) instead of one function call,
+-- each with its own index probe of responses, per candidate row.
+
+create table if not exists public.room_participants (
+    room_id uuid not null references public.rooms(id) on delete cascade,
+    user_id uuid not null references auth.users(id) on delete cascade,
+    joined_at timestamptz not null default now(),
+    primary key (room_id, user_id)
+);
+
+-- Policies look memberships up by caller
+create index if not exists idx_room_participants_user
+    on public.room_participants(user_id, room_id);
+
+alter table public.room_participants enable row level security;
+
+drop policy if exists "Users can read their memberships" on public.room_participants;
+create policy "Users can read their memberships"
+on public.room_participants
+for select
+to authenticated
+using (
+    user_id = (select auth.uid())
+);
+
+-- Writes only go through join_room / ensure_room_participant
+
+-- =========================================================
+-- Membership helpers
+-- =========================================================
+create or replace function public.is_room_participant(room_uuid uuid)
+returns boolean
+language sql
+security definer
+set search_path = public
+set row_security = off
+stable
+as $$
+  select exists (
+    select 1
+    from public.room_participants p
+    where p.room_id = room_uuid
+      and p.user_id = auth.uid()
+  );
+$$;
+
+-- Adds a member if the room has room for one. The caller must hold the
+-- room row lock, so concurrent joins are counted one at a time.
+create or replace function public.ensure_room_participant(
+    p_room_id uuid,
+    p_user_id uuid,
+    p_room_limit integer
+)
+returns integer
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    member_count integer;
+    is_member boolean;
+begin
+    select count(*), coalesce(bool_or(user_id = p_user_id), false)
+    into member_count, is_member
+    from public.room_participants
+    where room_id = p_room_id;
+
+    if is_member then
+        return member_count;
+    end if;
+
+    if member_count >= p_room_limit then
+        raise exception 'Room is full';
+    end if;
+
+    insert into public.room_participants (room_id, user_id)
+    values (p_room_id, p_user_id);
+
+    return member_count + 1;
+end;
+$$;
+
+revoke execute on function public.ensure_room_participant(uuid, uuid, integer) from public, anon, authenticated;
+
+create or replace function public.join_room(p_room_id uuid)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    caller uuid := auth.uid();
+    room_limit integer;
+    member_count integer;
+begin
+    if caller is null then
+        raise exception 'Not authenticated' using errcode = '28000';
+    end if;
+
+    select max_participants
+    into room_limit
+    from public.rooms
+    where id = p_room_id
+    for update;
+
+    if room_limit is null then
+        raise exception 'Room not found';
+    end if;
+
+    member_count := public.ensure_room_participant(p_room_id, caller, room_limit);
+
+    return jsonb_build_object(
+        'room_id', p_room_id,
+        'participant_count', member_count,
+        'max_participants', room_limit
+    );
+end;
+$$;
+
+grant execute on function public.join_room(uuid) to authenticated;
+
+-- =========================================================
+-- RLS: membership semi-join instead of a per-row function call
+-- =========================================================
+drop policy if exists "Room participants can read responses" on public.responses;
+create policy "Room participants can read responses"
+on public.responses
+for select
+using (
+    room_id in (
+        select p.room_id
+        from public.room_participants p
+        where p.user_id = (select auth.uid())
+    )
+);
+
+drop policy if exists "Room participants can read stats" on public.room_stats;
+create policy "Room participants can read stats"
+on public.room_stats
+for select
+to authenticated
+using (
+    room_id in (
+        select p.room_id
+        from public.room_participants p
+        where p.user_id = (select auth.uid())
+    )
+);
+
+-- =========================================================
+-- Capacity: members instead of distinct answers per day
+-- =========================================================
+create or replace function public.check_room_capacity()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    room_limit integer;
+begin
+    if current_setting('app.response_prevalidated', true) = 'on' then
+        return new;
+    end if;
+
+    -- Lock del room
+    select max_participants
+    into room_limit
+    from public.rooms
+    where id = new.room_id
+    for update;
+
+    -- First answer joins the room; outsiders of a full room are rejected
+    perform public.ensure_room_participant(new.room_id, new.user_id, room_limit);
+
+    return new;
+end;
+$$;
+
+create or replace function public.submit_response(
+    p_room_id uuid,
+    p_daily_question_id uuid,
+    p_self_option_id uuid,
+    p_partner_prediction_option_id uuid
+)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    caller uuid := auth.uid();
+    room_limit integer;
+    correct_question uuid;
+    answered uuid[];
+    new_response_id uuid;
+    answer_count integer;
+begin
+    if caller is null then
+        raise exception 'Not authenticated' using errcode = '28000';
+    end if;
+
+    -- Lock del room (serializes concurrent answers for the same room)
+    select max_participants
+    into room_limit
+    from public.rooms
+    where id = p_room_id
+    for update;
+
+    if room_limit is null then
+        raise exception 'Room not found';
+    end if;
+
+    select question_id
+    into correct_question
+    from public.daily_questions
+    where id = p_daily_question_id;
+
+    if not exists (
+        select 1 from public.options
+        where id = p_self_option_id
+          and question_id = correct_question
+    ) then
+        raise exception 'Invalid self option for this question';
+    end if;
+
+    if not exists (
+        select 1 from public.options
+        where id = p_partner_prediction_option_id
+          and question_id = correct_question
+    ) then
+        raise exception 'Invalid partner prediction option';
+    end if;
+
+    select coalesce(array_agg(distinct user_id), '{}')
+    into answered
+    from public.responses
+    where room_id = p_room_id
+      and daily_question_id = p_daily_question_id;
+
+    if caller = any(answered) then
+        raise exception 'duplicate key value violates unique constraint "uniq_response_per_user_day"'
+            using errcode = '23505';
+    end if;
+
+    -- Members may always answer; a first answer joins if there is room
+    perform public.ensure_room_participant(p_room_id, caller, room_limit);
+
+    perform set_config('app.response_prevalidated', 'on', true);
+
+    insert into public.responses (
+        room_id,
+        user_id,
+        daily_question_id,
+        self_option_id,
+        partner_prediction_option_id
+    )
+    values (
+        p_room_id,
+        caller,
+        p_daily_question_id,
+        p_self_option_id,
+        p_partner_prediction_option_id
+    )
+    returning id into new_response_id;
+
+    perform set_config('app.response_prevalidated', 'off', true);
+
+    answer_count := cardinality(answered) + 1;
+
+    return jsonb_build_object(
+        'response_id', new_response_id,
+        'room_id', p_room_id,
+        'daily_question_id', p_daily_question_id,
+        'answer_count', answer_count,
+        'both_answered', answer_count >= 2,
+        'user_answered', true
+    );
+end;
+$$;
+
+grant execute on function public.submit_response(uuid, uuid, uuid, uuid) to authenticated;
+
+-- =========================================================
+-- BACKFILL: members from existing responses
+-- =========================================================
+-- Rooms where different users answered on different days keep all of
+-- them; capacity only applies to new members.
+insert into public.room_participants (room_id, user_id, joined_at)
+select room_id, user_id, min(created_at)
+from public.responses
+group by room_id, user_id
+on conflict (room_id, user_id) do nothing;
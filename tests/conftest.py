@@ -0,0 +1,62 @@
+"""
+Shared fixtures: the app wired to the in-process Supabase stand-in from
+benchmarks/fake_supabase.py, so tests drive real routes and services
+without network access.
+"""
+import os
+
+import httpx
+import pytest
+
+JWT_SECRET = "test-secret-test-secret-test-secret-test"
+
+# The app reads its configuration at import time
+os.environ.update({
+    "SUPABASE_URL": "http://supabase.local",
+    "SUPABASE_ANON_KEY": "anon-key",
+    "SUPABASE_SERVICE_ROLE_KEY": "service-role-key",
+    "SUPABASE_JWT_SECRET": JWT_SECRET,
+    "JWT_VERIFY_MODE": "local",
+    "DATA_BACKEND": "postgrest",
+    "QUESTION_PREWARM_ENABLED": "false",
+    "ROOM_POOL_SIZE": "0",
+    "APP_URL": "http://testserver"
+})
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.utils.supabase import InstrumentedTransport, registry  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def fake() -> FakeSupabase:
+    """One stand-in for the session; tests create their own users and rooms."""
+    fake = FakeSupabase(JWT_SECRET)
+    registry._http_client = httpx.AsyncClient(
+        transport=InstrumentedTransport(httpx.ASGITransport(fake.app))
+    )
+    return fake
+
+
+@pytest.fixture
+def new_client(fake):
+    """Factory for browser-like clients, each with its own cookie jar."""
+    def make() -> TestClient:
+        return TestClient(app)
+    return make
+
+
+@pytest.fixture
+def answer(fake):
+    """Body of a valid answer to the stand-in's daily question."""
+    def build(room_id: str) -> dict:
+        self_option, prediction = fake.option_ids[:2]
+        return {
+            "room_id": room_id,
+            "daily_question_id": fake.question["id"],
+            "self_option_id": self_option,
+            "partner_prediction_option_id": prediction
+        }
+    return build
@@ -0,0 +1,80 @@
+"""The answer status event stream."""
+import orjson
+import pytest
+
+from app.routes import responses as responses_routes
+from app.services import event_service, response_service
+
+
+@pytest.fixture
+def member_room(new_client):
+    """A fresh room and its creator's client."""
+    creator = new_client()
+    room = creator.post("/api/rooms").json()
+    return room, creator
+
+
+def _statuses(body: str):
+    return [
+        orjson.loads(line[len("data: "):])
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def _events_url(room_id: str, daily_question_id: str) -> str:
+    return f"/api/responses/room/{room_id}/events/{daily_question_id}"
+
+
+def test_events_forbidden_for_non_participant(fake, new_client, member_room):
+    room, _ = member_room
+    outsider = new_client()
+    assert outsider.post("/api/rooms").status_code == 200
+
+    response = outsider.get(_events_url(room["id"], fake.question["id"]))
+
+    assert response.status_code == 403
+    assert event_service.hub.stats()["connections"] == 0
+
+
+def test_answer_published_before_the_initial_read_is_not_lost(
+    fake, member_room, monkeypatch
+):
+    room, creator = member_room
+    read_answered = response_service.get_answered_user_ids
+
+    async def partner_answers_meanwhile(room_id, daily_question_id, access_token):
+        answered = await read_answered(room_id, daily_question_id, access_token)
+        event_service.publish_response(room_id, daily_question_id, "partner")
+        event_service.publish_response(room_id, daily_question_id, "someone-else")
+        return answered
+
+    monkeypatch.setattr(
+        response_service, "get_answered_user_ids", partner_answers_meanwhile
+    )
+
+    response = creator.get(_events_url(room["id"], fake.question["id"]))
+
+    assert response.status_code == 200
+    assert _statuses(response.text)[-1]["both_answered"] is True
+    assert event_service.hub.stats()["connections"] == 0
+
+
+def test_status_is_refreshed_from_the_database(fake, member_room, monkeypatch):
+    room, creator = member_room
+    reads = iter([{"creator"}, {"creator"}, {"creator", "partner"}])
+
+    async def answered_on_another_worker(room_id, daily_question_id, access_token):
+        return next(reads)
+
+    monkeypatch.setattr(
+        response_service, "get_answered_user_ids", answered_on_another_worker
+    )
+    monkeypatch.setattr(responses_routes, "SSE_HEARTBEAT_INTERVAL", 0.01)
+    monkeypatch.setattr(responses_routes, "SSE_STATUS_REFRESH_INTERVAL", 0)
+
+    response = creator.get(_events_url(room["id"], fake.question["id"]))
+
+    statuses = _statuses(response.text)
+    assert [status["answer_count"] for status in statuses] == [1, 2]
+    assert statuses[-1]["both_answered"] is True
@@ -0,0 +1,110 @@
+"""Accept-Encoding negotiation for dynamic and precompressed responses."""
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.testclient import TestClient
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+from app.middleware import CompressionMiddleware
+from app.utils.assets import PrecompressedStaticFiles
+from app.utils.http import accepts_encoding
+
+
+@pytest.mark.parametrize("header, encoding, expected", [
+    ("gzip, deflate, br", "gzip", True),
+    ("GZIP", "gzip", True),
+    ("gzip;q=0", "gzip", False),
+    ("gzip; q=0.0, br", "gzip", False),
+    ("br;q=0, gzip;q=0.5", "br", False),
+    ("br;q=0, gzip;q=0.5", "gzip", True),
+    ("x-gzip", "gzip", False),
+    ("*", "br", True),
+    ("*;q=0", "br", False),
+    ("*;q=0, gzip", "gzip", True),
+    ("gzip;q=0, *", "gzip", False),
+    ("", "gzip", False),
+])
+def test_accepts_encoding(header, encoding, expected):
+    assert accepts_encoding(header, encoding) is expected
+
+
+@pytest.fixture
+def dynamic_client():
+    async def page(request):
+        return PlainTextResponse("x" * 1000)
+
+    async def precompressed(request):
+        return PlainTextResponse("x" * 1000, headers={"Content-Encoding": "identity"})
+
+    async def events(request):
+        async def stream():
+            for _ in range(3):
+                yield "data: " + "x" * 300 + "\n\n"
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    app = Starlette(routes=[
+        Route("/", page),
+        Route("/precompressed", precompressed),
+        Route("/events", events),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header, encoding", [
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("identity, gzip;q=0", None),
+])
+def test_dynamic_compression_honours_q_values(dynamic_client, header, encoding):
+    response = dynamic_client.get("/", headers={"Accept-Encoding": header})
+
+    assert response.headers.get("content-encoding") == encoding
+    assert response.text == "x" * 1000
+
+
+@pytest.mark.parametrize("path", ["/precompressed", "/events"])
+def test_encoded_and_event_stream_responses_pass_through(dynamic_client, path):
+    response = dynamic_client.get(path, headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers.get("content-encoding") != "gzip"
+    assert "Accept-Encoding" not in response.headers.get("vary", "")
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    (dist / "app.abc.js").write_text("plain")
+    (dist / "app.abc.js.gz").write_bytes(gzip.compress(b"gzipped"))
+    # The test client only decodes brotli bodies when brotli is installed
+    (dist / "app.abc.js.br").write_bytes(
+        brotli.compress(b"brotli") if brotli is not None else b"brotli"
+    )
+
+    app = Starlette(routes=[
+        Mount("/static", PrecompressedStaticFiles(directory=tmp_path)),
+    ])
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header, encoding, body", [
+    ("br, gzip", "br", "brotli"),
+    ("br;q=0, gzip", "gzip", "gzipped"),
+    ("br;q=0, gzip;q=0", None, "plain"),
+])
+def test_precompressed_variant_honours_q_values(static_client, header, encoding, body):
+    response = static_client.get(
+        "/static/dist/app.abc.js",
+        headers={"Accept-Encoding": header},
+    )
+
+    assert response.headers.get("content-encoding") == encoding
+    assert response.content.decode() == body
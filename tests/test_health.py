@@ -0,0 +1,11 @@
+"""/health reports the state of the in-process caches."""
+
+
+def test_health_reports_daily_question_cache(new_client):
+    client = new_client()
+    assert client.get("/api/questions/today").status_code == 200
+
+    health = client.get("/health").json()
+    assert health["daily_question"]["entries"] >= 1
+    assert health["daily_question"]["tracked_timezones"] >= 1
+    assert "daily_question" in health["caches"]
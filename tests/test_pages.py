@@ -0,0 +1,29 @@
+"""Cache headers of the server-rendered pages."""
+
+
+def test_landing_page_is_private_to_the_browser(new_client):
+    response = new_client().get("/", headers={"X-Timezone": "Europe/Madrid"})
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("private, max-age=")
+    assert "s-maxage" not in response.headers["cache-control"]
+    assert "Cookie" in response.headers["vary"]
+
+
+def test_join_page_is_shared(new_client):
+    response = new_client().get("/join-room", params={"token": "abc"})
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("public, max-age=")
+    assert "s-maxage=" in response.headers["cache-control"]
+    assert "Cookie" not in response.headers.get("vary", "")
+
+
+def test_landing_page_revalidates_with_etag(new_client):
+    client = new_client()
+    etag = client.get("/").headers["etag"]
+
+    response = client.get("/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["cache-control"].startswith("private, ")
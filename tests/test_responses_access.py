@@ -0,0 +1,82 @@
+"""Reading a room's responses is limited to its participants (403 otherwise)."""
+import pytest
+
+from app.services.response_service import encode_cursor
+
+
+@pytest.fixture
+def answered_room(new_client, answer):
+    """A room where the creator has answered, plus the creator's client."""
+    creator = new_client()
+    room = creator.post("/api/rooms").json()
+    assert creator.post("/api/responses", json=answer(room["id"])).status_code == 200
+    return room, creator
+
+
+def _outsider(new_client):
+    # Any write gives the client a session without joining the room
+    outsider = new_client()
+    assert outsider.post("/api/rooms").status_code == 200
+    return outsider
+
+
+def test_history_forbidden_for_non_participant(new_client, answered_room):
+    room, _ = answered_room
+    response = _outsider(new_client).get(f"/api/responses/room/{room['id']}")
+    assert response.status_code == 403
+
+
+def test_history_forbidden_in_room_without_answers(new_client):
+    room = new_client().post("/api/rooms").json()
+    response = _outsider(new_client).get(f"/api/responses/room/{room['id']}")
+    assert response.status_code == 403
+
+
+def test_history_forbidden_for_non_participant_with_cursor(new_client, answered_room):
+    room, creator = answered_room
+    newest = creator.get(f"/api/responses/room/{room['id']}").json()["responses"][0]
+
+    response = _outsider(new_client).get(
+        f"/api/responses/room/{room['id']}",
+        params={"cursor": encode_cursor(newest)}
+    )
+    assert response.status_code == 403
+
+
+def test_daily_responses_forbidden_for_non_participant(fake, new_client, answered_room):
+    room, _ = answered_room
+    response = _outsider(new_client).get(
+        f"/api/responses/room/{room['id']}/daily/{fake.question['id']}"
+    )
+    assert response.status_code == 403
+
+
+def test_participant_reads_history_and_daily_responses(fake, answered_room):
+    room, creator = answered_room
+
+    history = creator.get(f"/api/responses/room/{room['id']}")
+    assert history.status_code == 200
+    assert len(history.json()["responses"]) == 1
+
+    daily = creator.get(f"/api/responses/room/{room['id']}/daily/{fake.question['id']}")
+    assert daily.status_code == 200
+    assert len(daily.json()) == 1
+
+
+def test_member_reads_history_before_answering(new_client, answered_room):
+    room, _ = answered_room
+    partner = new_client()
+    assert partner.post(f"/api/rooms/{room['token']}/join").status_code == 200
+
+    history = partner.get(f"/api/responses/room/{room['id']}")
+    assert history.status_code == 200
+    assert len(history.json()["responses"]) == 1
+
+
+def test_member_of_room_without_answers_gets_empty_history(new_client):
+    creator = new_client()
+    room = creator.post("/api/rooms").json()
+
+    history = creator.get(f"/api/responses/room/{room['id']}")
+    assert history.status_code == 200
+    assert history.json() == {"responses": [], "next_cursor": None}
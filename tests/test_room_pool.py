@@ -0,0 +1,63 @@
+"""Pre-created rooms: expiry of a worker's pool and cleanup of stale rows."""
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services import room_service
+
+
+def _room(fake, claimed: bool, age: timedelta) -> str:
+    created_at = (datetime.now(timezone.utc) - age).isoformat()
+    room = {
+        "id": f"pool-{len(fake.rooms)}-{claimed}-{age.days}",
+        "token": f"POOL{len(fake.rooms)}",
+        "room_type": "couple",
+        "max_participants": 2,
+        "is_permanent": False,
+        "streak_count": 0,
+        "created_at": created_at,
+        "claimed_at": created_at if claimed else None
+    }
+    fake.rooms[room["id"]] = room
+    return room["id"]
+
+
+@pytest.fixture
+def pool(fake, monkeypatch):
+    monkeypatch.setattr(room_service, "ROOM_POOL_SIZE", 2)
+    monkeypatch.setattr(room_service, "_room_pool", deque())
+    return room_service._room_pool
+
+
+def test_cleanup_deletes_only_stale_unclaimed_rooms(fake):
+    stale = _room(fake, claimed=False, age=timedelta(days=2))
+    claimed = _room(fake, claimed=True, age=timedelta(days=2))
+    fresh = _room(fake, claimed=False, age=timedelta(hours=1))
+
+    assert asyncio.run(room_service.cleanup_unclaimed_rooms()) == 1
+
+    assert stale not in fake.rooms
+    assert claimed in fake.rooms
+    assert fresh in fake.rooms
+
+
+def test_pooled_rooms_are_claimed_once(fake, pool):
+    assert asyncio.run(room_service.refill_room_pool()) == 2
+
+    room = asyncio.run(room_service._claim_pooled_room())
+
+    assert fake.rooms[room["id"]]["claimed_at"] is not None
+    assert len(pool) == 1
+
+
+def test_expired_pooled_rooms_are_not_handed_out(fake, pool, monkeypatch):
+    assert asyncio.run(room_service.refill_room_pool()) == 2
+    pooled = [room["id"] for _, room in pool]
+
+    # Past the worker's TTL the cleanup may already have deleted them
+    monkeypatch.setattr(room_service, "_POOLED_ROOM_TTL", -1)
+
+    assert asyncio.run(room_service._claim_pooled_room()) is None
+    assert all(fake.rooms[room_id]["claimed_at"] is None for room_id in pooled)
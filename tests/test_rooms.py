@@ -0,0 +1,48 @@
+"""Room membership: create, join by token, answer."""
+
+
+def test_create_join_and_partner_answers(new_client, answer):
+    creator = new_client()
+    room = creator.post("/api/rooms").json()
+
+    partner = new_client()
+    joined = partner.post(f"/api/rooms/{room['token']}/join")
+    assert joined.status_code == 200
+    assert joined.json() == {
+        "room_id": room["id"],
+        "participant_count": 2,
+        "max_participants": 2
+    }
+    assert partner.cookies, "join must hand the new session to the browser"
+
+    # The seat taken on join belongs to the same user that answers
+    submitted = partner.post("/api/responses", json=answer(room["id"]))
+    assert submitted.status_code == 200
+    assert submitted.json()["answer_count"] == 1
+
+    submitted = creator.post("/api/responses", json=answer(room["id"]))
+    assert submitted.status_code == 200
+    assert submitted.json()["both_answered"] is True
+
+
+def test_join_is_idempotent(new_client):
+    room = new_client().post("/api/rooms").json()
+
+    partner = new_client()
+    assert partner.post(f"/api/rooms/{room['token']}/join").status_code == 200
+    again = partner.post(f"/api/rooms/{room['token']}/join")
+    assert again.status_code == 200
+    assert again.json()["participant_count"] == 2
+
+
+def test_full_room_rejects_new_members(new_client, answer):
+    room = new_client().post("/api/rooms").json()
+    assert new_client().post(f"/api/rooms/{room['token']}/join").status_code == 200
+
+    outsider = new_client()
+    assert outsider.post(f"/api/rooms/{room['token']}/join").status_code == 409
+    assert outsider.post("/api/responses", json=answer(room["id"])).status_code == 400
+
+
+def test_join_unknown_token(new_client):
+    assert new_client().post("/api/rooms/NOPE/join").status_code == 404
@@ -0,0 +1,61 @@
+"""Session cookies set by the auth dependencies reach the client."""
+import time
+
+import jwt
+
+from app.config import SESSION_ACCESS_COOKIE, SESSION_REFRESH_COOKIE
+
+from .conftest import JWT_SECRET
+
+
+def _set_cookie_names(response) -> set:
+    return {
+        header.split("=", 1)[0]
+        for header in response.headers.get_list("set-cookie")
+    }
+
+
+def test_cookieless_write_sets_session_cookies(new_client, answer):
+    creator = new_client()
+    room = creator.post("/api/rooms")
+    assert room.status_code == 200
+    assert _set_cookie_names(room) == {SESSION_ACCESS_COOKIE, SESSION_REFRESH_COOKIE}
+
+    partner = new_client()
+    submitted = partner.post("/api/responses", json=answer(room.json()["id"]))
+    assert submitted.status_code == 200
+    assert _set_cookie_names(submitted) == {SESSION_ACCESS_COOKIE, SESSION_REFRESH_COOKIE}
+
+    # The new session works on the next request
+    state = partner.get(
+        f"/api/responses/room/{room.json()['id']}/state/{answer('')['daily_question_id']}"
+    )
+    assert state.status_code == 200
+    assert state.json()["user_answered"] is True
+
+
+def test_expired_access_token_rotates_refresh_cookie(fake, new_client):
+    client = new_client()
+    assert client.post("/api/rooms").status_code == 200
+
+    refresh_token = client.cookies[SESSION_REFRESH_COOKIE]
+    user_id = fake.refresh_tokens[refresh_token]
+    expired = jwt.encode(
+        {
+            "sub": user_id,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "exp": int(time.time()) - 60
+        },
+        JWT_SECRET,
+        algorithm="HS256"
+    )
+    client.cookies.set(SESSION_ACCESS_COOKIE, expired)
+
+    response = client.post("/api/rooms")
+    assert response.status_code == 200
+    assert _set_cookie_names(response) == {SESSION_ACCESS_COOKIE, SESSION_REFRESH_COOKIE}
+
+    rotated = client.cookies[SESSION_REFRESH_COOKIE]
+    assert rotated != refresh_token
+    assert fake.refresh_tokens[rotated] == user_id
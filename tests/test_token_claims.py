@@ -0,0 +1,66 @@
+"""Claims used by the direct Postgres backend, with the GoTrue fallback."""
+import asyncio
+import time
+
+import jwt
+import pytest
+
+from app.utils import tokens
+
+from .conftest import JWT_SECRET
+
+
+def _token(sub: str, secret: str = JWT_SECRET, **headers) -> str:
+    return jwt.encode(
+        {
+            "sub": sub,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "exp": int(time.time()) + 600
+        },
+        secret,
+        algorithm="HS256",
+        headers=headers or None
+    )
+
+
+@pytest.fixture
+def user_id(new_client, fake):
+    client = new_client()
+    assert client.post("/api/rooms").status_code == 200
+    return next(reversed(fake.users))
+
+
+def test_verified_locally_without_upstream_calls(fake, user_id):
+    calls = fake.calls
+    claims = asyncio.run(tokens.resolve_claims(_token(user_id)))
+    assert claims["sub"] == user_id
+    assert fake.calls == calls
+
+
+def test_falls_back_to_gotrue_when_key_is_unavailable(fake, user_id, monkeypatch):
+    # HS256 token and no shared secret configured: not verifiable locally
+    monkeypatch.setattr(tokens, "SUPABASE_JWT_SECRET", "")
+    token = _token(user_id)
+
+    calls = fake.calls
+    assert asyncio.run(tokens.resolve_claims(token))["sub"] == user_id
+    assert fake.calls == calls + 1
+
+    # Cached for the next query with the same token
+    assert asyncio.run(tokens.resolve_claims(token))["sub"] == user_id
+    assert fake.calls == calls + 1
+
+
+def test_falls_back_to_gotrue_in_remote_mode(fake, user_id, monkeypatch):
+    monkeypatch.setattr(tokens, "JWT_VERIFY_MODE", "remote")
+    calls = fake.calls
+    assert asyncio.run(tokens.resolve_claims(_token(user_id, kid="fresh")))["sub"] == user_id
+    assert fake.calls == calls + 1
+
+
+def test_gotrue_rejection_is_an_invalid_token(monkeypatch):
+    monkeypatch.setattr(tokens, "SUPABASE_JWT_SECRET", "")
+    forged = _token("00000000-0000-0000-0000-000000000000", secret="not-the-project-secret-at-all-ever")
+    with pytest.raises(tokens.InvalidTokenError):
+        asyncio.run(tokens.resolve_claims(forged))
@@ -0,0 +1,37 @@
+"""Upstream operation names and the Server-Timing header built from them."""
+import re
+
+import httpx
+import pytest
+
+from app.utils.supabase import upstream_operation
+from app.utils.tracing import RequestTrace, UpstreamCall, metric_token
+
+TOKEN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+@pytest.mark.parametrize("method, url, expected", [
+    ("GET", "http://s/auth/v1/.well-known/jwks.json", "auth.jwks"),
+    ("GET", "http://s/auth/v1/.well-known/openid-configuration", "auth.well-known_openid-configuration"),
+    ("POST", "http://s/auth/v1/token?grant_type=refresh_token", "auth.refresh_session"),
+    ("POST", "http://s/rest/v1/rpc/submit_response", "rpc.submit_response"),
+    ("GET", "http://s/rest/v1/rooms?id=eq.1", "rooms.select"),
+])
+def test_operation_names_are_tokens(method, url, expected):
+    operation = upstream_operation(httpx.Request(method, url))
+    assert operation == expected
+    assert TOKEN.match(operation)
+
+
+def test_metric_token_collapses_dots_and_invalid_characters():
+    assert metric_token("auth..well-known/jwks.json") == "auth.well-known_jwks.json"
+    assert metric_token("...") == "other"
+
+
+def test_server_timing_uses_valid_metric_names():
+    trace = RequestTrace()
+    trace.calls.append(UpstreamCall("auth..well-known/jwks.json", 0.002, "ok"))
+    trace.calls.append(UpstreamCall("pg.rooms.select", 0.001, "ok"))
+
+    names = [metric.split(";", 1)[0].strip() for metric in trace.server_timing().split(",")]
+    assert names == ["upstream", "auth.well-known_jwks.json", "pg.rooms.select", "app"]